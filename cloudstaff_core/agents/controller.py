@@ -1,46 +1,42 @@
 from cloudstaff_core.agents.commands import Command
-from cloudstaff_core.agents.state_machine import STATE_TRANSITIONS
+from cloudstaff_core.agents.state_machine import CONTROLLER_MACHINE
 from cloudstaff_core.agents.sarah import Sarah
 
 
+def _schedule_meeting(sarah, payload):
+    text = "schedule meeting"
+    if payload:
+        text += f" {payload}"
+    return sarah.respond(text)
+
+
+# Command -> handler(sarah, payload)
+HANDLERS = {
+    Command.STATUS.value: lambda sarah, payload: sarah.respond("status"),
+    Command.REPORT.value: lambda sarah, payload: sarah.respond("report"),
+    Command.RESET.value: lambda sarah, payload: sarah.respond("reset"),
+    Command.CLIENT_INTAKE.value: lambda sarah, payload: sarah.respond("client intake"),
+    Command.SCHEDULE_MEETING.value: _schedule_meeting,
+    Command.SEND_FOLLOW_UP.value: lambda sarah, payload: sarah.respond("send follow up"),
+    Command.SUMMARIZE.value: lambda sarah, payload: sarah.respond(f"summarize {payload}"),
+}
+
+
 class SarahController:
+    machine = CONTROLLER_MACHINE
+    routes = CONTROLLER_MACHINE.dispatch_table(HANDLERS)
+
     def __init__(self):
         self.sarah = Sarah()
 
     def execute(self, command: Command, payload: str = "") -> str:
         current_state = self.sarah.workflow_state
-        allowed = STATE_TRANSITIONS.get(current_state, set())
 
-        if command.value not in allowed:
+        handler = self.routes.get((current_state, command.value))
+        if handler is None:
             return (
                 f"Illegal action '{command.value}' "
                 f"from state '{current_state}'."
             )
 
-        # Dispatch
-        if command == Command.STATUS:
-            return self.sarah.respond("status")
-
-        if command == Command.REPORT:
-            return self.sarah.respond("report")
-
-        if command == Command.RESET:
-            return self.sarah.respond("reset")
-
-        if command == Command.CLIENT_INTAKE:
-            return self.sarah.respond("client intake")
-
-        if command == Command.SCHEDULE_MEETING:
-            text = "schedule meeting"
-            if payload:
-                text += f" {payload}"
-            return self.sarah.respond(text)
-
-        if command == Command.SEND_FOLLOW_UP:
-            return self.sarah.respond("send follow up")
-
-        if command == Command.SUMMARIZE:
-            return self.sarah.respond(f"summarize {payload}")
-
-        return "Unhandled command."
-
+        return handler(self.sarah, payload)
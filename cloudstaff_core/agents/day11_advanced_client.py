@@ -1,11 +1,10 @@
-from cloudstaff_core.storage.event_store import log_event, load_events
+from cloudstaff_core.storage.event_store import log_event, iter_events
 from cloudstaff_core.storage.snapshot_engine import save_snapshot
 
 clients = {}
 
 def rebuild_state():
-    events = load_events()
-    for e in events:
+    for e in iter_events():
         c = e["client"]
         clients.setdefault(c, {"invoiced": 0.0, "paid": 0.0})
         if e["action"] == "Invoice issued":
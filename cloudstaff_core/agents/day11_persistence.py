@@ -1,16 +1,57 @@
 import json
+import hashlib
+import hmac
 from pathlib import Path
-from cloudstaff_core.agents.event_replay import replay_events
+from cloudstaff_core.agents.event_replay import replay_checkpoint
+from cloudstaff_core.config.settings import get_settings
 
 SNAPSHOT_PATH = Path("cloudstaff_core/storage/snapshots/latest.json")
 
 
+def snapshot_digest(snapshot: dict, key: str = None) -> str:
+    """
+    Digest over the snapshot's anchor and state, canonically encoded.
+
+    With a key (SNAPSHOT_HMAC_KEY) this is an HMAC-SHA256, which only a
+    key holder can recompute after editing the state. Without one it is
+    a plain sha256: it catches corruption, but anyone who edits the
+    state can recompute it, so only a full replay detects edits.
+    """
+    payload = json.dumps(
+        {"anchor": snapshot["anchor"], "state": snapshot["state"]},
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    if key:
+        return hmac.new(key.encode("utf-8"), payload, hashlib.sha256).hexdigest()
+    return hashlib.sha256(payload).hexdigest()
+
+
 def write_snapshot():
-    state = replay_events()
-    SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    """
+    Writes the replayed state together with its anchor: the log position
+    and event_hash of the last event it includes, so integrity checks can
+    verify the snapshot and replay only what came after it.
+    """
+    checkpoint = replay_checkpoint()
+    snapshot = {
+        "anchor": {
+            "offset": checkpoint["offset"],
+            "line": checkpoint["line"],
+            "last_line_offset": checkpoint["last_line_offset"],
+            "event_hash": checkpoint["last_hash"],
+        },
+        "state": checkpoint["state"],
+    }
+    key = get_settings().SNAPSHOT_HMAC_KEY
+    snapshot["digest_keyed"] = bool(key)
+    snapshot["digest"] = snapshot_digest(snapshot, key)
 
-    with SNAPSHOT_PATH.open("w", encoding="utf-8") as f:
-        json.dump(state, f, sort_keys=True, indent=2)
+    SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = SNAPSHOT_PATH.with_name(SNAPSHOT_PATH.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(snapshot, f, sort_keys=True, indent=2)
+    tmp_path.replace(SNAPSHOT_PATH)
 
     print("Snapshot written. Events persisted.")
 
@@ -1,21 +1,21 @@
 import json
 import hashlib
 from pathlib import Path
+from cloudstaff_core.agents.day11_persistence import snapshot_digest
+from cloudstaff_core.config.settings import get_settings
+from cloudstaff_core.agents.event_replay import (
+    GENESIS_CHECKPOINT,
+    advance_checkpoint,
+    checkpoint_is_valid,
+)
+from cloudstaff_core.storage.event_store import iter_events
 
 EVENTS_PATH = Path("cloudstaff_core/storage/events/events.jsonl")
 SNAPSHOT_PATH = Path("cloudstaff_core/storage/snapshots/latest.json")
 
 
 def load_events():
-    events = []
-    if not EVENTS_PATH.exists():
-        return events
-
-    with open(EVENTS_PATH, "r") as f:
-        for line in f:
-            if line.strip():
-                events.append(json.loads(line))
-    return events
+    return list(iter_events(path=EVENTS_PATH))
 
 
 def replay_events():
@@ -25,7 +25,7 @@ def replay_events():
     """
     state = {}
 
-    for event in load_events():
+    for event in iter_events(path=EVENTS_PATH):
         client = event.get("client")
         amount = float(event.get("amount", 0.0))
 
@@ -50,18 +50,39 @@ def hash_state(state: dict) -> str:
     return hashlib.sha256(payload).hexdigest()
 
 
-def integrity_check():
+def integrity_check(full: bool = False):
+    """
+    Anchored snapshots (written by day11_persistence) are checked in
+    O(new events): the snapshot digest, the anchor event still being in
+    the log, and the hash chain of every event after it. full=True also
+    replays the history up to the anchor and compares it with the
+    snapshot. Plain legacy snapshots always take the full replay.
+
+    The digest only proves the state was not edited when it is keyed
+    (SNAPSHOT_HMAC_KEY set when the snapshot was written and now). An
+    unkeyed digest can be recomputed by whoever edits the state, so
+    without a key only full=True detects edits to the snapshot state.
+    """
     print("--- DAY 12 INTEGRITY TEST ---")
 
-    replayed_state = replay_events()
-    replay_hash = hash_state(replayed_state)
-
     if not SNAPSHOT_PATH.exists():
         raise RuntimeError("Snapshot missing — cannot verify integrity")
 
     with open(SNAPSHOT_PATH, "r") as f:
-        snapshot_state = json.load(f)
+        snapshot = json.load(f)
+
+    if "anchor" in snapshot:
+        state = _anchored_check(snapshot, full)
+    else:
+        state = _legacy_check(snapshot)
 
+    print("--- DAY 12 COMPLETE ---")
+    return state
+
+
+def _legacy_check(snapshot_state: dict):
+    replayed_state = replay_events()
+    replay_hash = hash_state(replayed_state)
     snapshot_hash = hash_state(snapshot_state)
 
     print(f"REPLAY HASH:   {replay_hash}")
@@ -71,4 +92,52 @@ def integrity_check():
         raise RuntimeError("INTEGRITY FAILURE: Snapshot does not match replay")
 
     print("INTEGRITY VERIFIED: Snapshot matches replayed state")
-    print("--- DAY 12 COMPLETE ---")
+    return replayed_state
+
+
+def _anchored_check(snapshot: dict, full: bool):
+    key = get_settings().SNAPSHOT_HMAC_KEY
+    if key and not snapshot.get("digest_keyed"):
+        # Never fall back to the unkeyed digest when a key is configured
+        raise RuntimeError("INTEGRITY FAILURE: Snapshot digest is not keyed; rewrite the snapshot")
+    if snapshot.get("digest") != snapshot_digest(snapshot, key):
+        raise RuntimeError("INTEGRITY FAILURE: Snapshot digest mismatch")
+
+    anchor = snapshot["anchor"]
+    checkpoint = {
+        "offset": anchor["offset"],
+        "line": anchor["line"],
+        "last_line_offset": anchor["last_line_offset"],
+        "last_hash": anchor["event_hash"],
+        "state": snapshot["state"],
+    }
+    snapshot_hash = hash_state(snapshot["state"])
+
+    if full:
+        replayed = advance_checkpoint(GENESIS_CHECKPOINT, EVENTS_PATH, end=anchor["offset"])
+        replay_hash = hash_state(replayed["state"])
+
+        print(f"REPLAY HASH:   {replay_hash}")
+        print(f"SNAPSHOT HASH: {snapshot_hash}")
+
+        if (replayed["offset"], replayed["last_hash"]) != (anchor["offset"], anchor["event_hash"]):
+            raise RuntimeError("INTEGRITY FAILURE: Snapshot anchor not found in event log")
+        if replay_hash != snapshot_hash:
+            raise RuntimeError("INTEGRITY FAILURE: Snapshot does not match replay")
+
+    elif not checkpoint_is_valid(checkpoint, EVENTS_PATH):
+        raise RuntimeError("INTEGRITY FAILURE: Snapshot anchor not found in event log")
+
+    elif key:
+        print(f"SNAPSHOT HASH: {snapshot_hash} (keyed digest verified)")
+
+    else:
+        print(f"SNAPSHOT HASH: {snapshot_hash} (unkeyed digest: detects corruption, "
+              "not edits; run with full=True or set SNAPSHOT_HMAC_KEY)")
+
+    # Chain-verify and apply only the events after the anchor
+    head = advance_checkpoint(checkpoint, EVENTS_PATH)
+    print(f"TAIL EVENTS:   {head['line'] - anchor['line']} verified after line {anchor['line']}")
+    print(f"HEAD HASH:     {hash_state(head['state'])}")
+    print("INTEGRITY VERIFIED: Snapshot anchored in event log, tail chain intact")
+    return head["state"]
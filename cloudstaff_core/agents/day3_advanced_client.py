@@ -1,11 +1,13 @@
-import sqlite3
 from datetime import datetime, timedelta
 
+from cloudstaff_core.storage.connection_pool import get_connection
+from cloudstaff_core.storage.ledger_search import search_ledger
+
 DB_PATH = "sarah.db"
 
 
 def connect_db():
-    return sqlite3.connect(DB_PATH)
+    return get_connection(DB_PATH)
 
 
 # -----------------------
@@ -106,20 +108,12 @@ def search_clients(keyword):
     """
 
     conn = connect_db()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT client_name, description, type, amount
-        FROM ledger
-        WHERE (client_name LIKE ? OR description LIKE ?)
-          AND NOT (amount = 0 AND type IN ('Invoice', 'Payment'))
-        ORDER BY date DESC
-        """,
-        (f"%{keyword}%", f"%{keyword}%"),
+    rows = search_ledger(
+        conn,
+        keyword,
+        where="NOT (amount = 0 AND type IN ('Invoice', 'Payment'))",
+        order_by="date DESC",
     )
-
-    rows = cursor.fetchall()
     conn.close()
     return rows
 
@@ -1,13 +1,16 @@
-import sqlite3
 from datetime import datetime, timedelta
 
+from cloudstaff_core.agents.reporting import client_reports as _client_reports
+from cloudstaff_core.storage.connection_pool import get_connection
+from cloudstaff_core.storage.ledger_search import search_ledger
+
 DB_PATH = "sarah.db"
 
 # -----------------------
 # Database connection
 # -----------------------
 def connect_db():
-    return sqlite3.connect(DB_PATH)
+    return get_connection(DB_PATH)
 
 # -----------------------
 # Core multi-client operations
@@ -45,6 +48,10 @@ def client_report(name):
         "invoice_count": invoice_count
     }
 
+def client_reports(clients=None):
+    """All client reports in one grouped query, keyed by client name."""
+    return _client_reports(DB_PATH, clients)
+
 # -----------------------
 # Overdue & priority clients
 # -----------------------
@@ -78,19 +85,8 @@ def high_value_clients(threshold=1000):
 # Semantic search
 # -----------------------
 def search_clients(keyword, types=None):
-    types_filter = ""
-    params = (f"%{keyword}%", f"%{keyword}%")
-    if types:
-        types_placeholders = ",".join("?"*len(types))
-        types_filter = f" AND type IN ({types_placeholders})"
-        params += tuple(types)
     conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute(f"""
-        SELECT client_name, description, type, amount FROM ledger
-        WHERE (client_name LIKE ? OR description LIKE ?){types_filter}
-    """, params)
-    result = cursor.fetchall()
+    result = search_ledger(conn, keyword, types=types)
     conn.close()
     return result
 
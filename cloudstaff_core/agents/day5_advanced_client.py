@@ -1,10 +1,13 @@
-import sqlite3
 from datetime import datetime, timedelta
 
+from cloudstaff_core.agents.reporting import client_reports as _client_reports
+from cloudstaff_core.storage.connection_pool import get_connection
+from cloudstaff_core.storage.ledger_search import search_ledger
+
 DB_PATH = "sarah.db"
 
 def connect_db():
-    return sqlite3.connect(DB_PATH)
+    return get_connection(DB_PATH)
 
 # -----------------------
 # Core multi-client operations
@@ -38,6 +41,10 @@ def client_report(name):
         "invoice_count": invoice_count
     }
 
+def client_reports(clients=None):
+    """All client reports in one grouped query, keyed by client name."""
+    return _client_reports(DB_PATH, clients)
+
 def overdue_clients(days=30):
     cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
     conn = connect_db()
@@ -66,12 +73,7 @@ def high_value_clients(threshold=1000):
 
 def search_clients(keyword):
     conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT client_name, description, type, amount FROM ledger
-        WHERE client_name LIKE ? OR description LIKE ?
-    """, (f"%{keyword}%", f"%{keyword}%"))
-    result = cursor.fetchall()
+    result = search_ledger(conn, keyword)
     conn.close()
     return result
 
@@ -79,11 +81,15 @@ def search_clients(keyword):
 # Bulk operations
 # -----------------------
 def bulk_invoice(clients, amounts, description="Bulk Invoice"):
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    rows = [
+        (name, "Invoice", amt, date_str, "Automated bulk", "pending", description, "Invoice", "open")
+        for name, amt in zip(clients, amounts)
+    ]
     conn = connect_db()
     cursor = conn.cursor()
-    for name, amt in zip(clients, amounts):
-        cursor.execute("INSERT INTO ledger (client_name, transaction_type, amount, date, notes, state, description, type, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                       (name, "Invoice", amt, datetime.now().strftime("%Y-%m-%d"), "Automated bulk", "pending", description, "Invoice", "open"))
+    cursor.executemany("INSERT INTO ledger (client_name, transaction_type, amount, date, notes, state, description, type, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                       rows)
     conn.commit()
     conn.close()
 
@@ -1,12 +1,15 @@
 # File: cloudstaff-core/agents/day6_advanced_client.py
 
-import sqlite3
 from datetime import datetime, timedelta
 
+from cloudstaff_core.agents.reporting import client_reports as _client_reports
+from cloudstaff_core.storage.connection_pool import get_connection
+from cloudstaff_core.storage.ledger_search import search_ledger
+
 DB_PATH = "sarah.db"
 
 def connect_db():
-    return sqlite3.connect(DB_PATH)
+    return get_connection(DB_PATH)
 
 # -----------------------
 # Core multi-client operations
@@ -44,6 +47,10 @@ def client_report(name):
         "payment_pct": payment_pct
     }
 
+def client_reports(clients=None):
+    """All client reports in one grouped query, keyed by client name."""
+    return _client_reports(DB_PATH, clients)
+
 def overdue_clients(days=30):
     cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
     conn = connect_db()
@@ -78,12 +85,7 @@ def high_value_clients(threshold=1000):
 # -----------------------
 def search_clients(keyword):
     conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT client_name, description, type, amount FROM ledger
-        WHERE client_name LIKE ? OR description LIKE ?
-    """, (f"%{keyword}%", f"%{keyword}%"))
-    result = cursor.fetchall()
+    result = search_ledger(conn, keyword)
     conn.close()
     return result
 
@@ -96,9 +98,7 @@ def notify_overdue():
         print(f"ALERT: {entry['client']} has overdue balance of {entry['amount']}")
 
 def automated_followups():
-    clients = get_all_clients()
-    for client in clients:
-        report = client_report(client)
+    for client, report in client_reports().items():
         if report["balance"] > 0:
             print(f"FOLLOW-UP: {client} has outstanding balance {report['balance']:.2f} ({report['payment_pct']:.1f}% paid)")
         if report["invoiced"] >= 1000:
@@ -1,10 +1,13 @@
-import sqlite3
 from datetime import datetime, timedelta
 
+from cloudstaff_core.agents.reporting import client_reports as _client_reports
+from cloudstaff_core.storage.connection_pool import get_connection
+from cloudstaff_core.storage.ledger_search import search_ledger
+
 DB_PATH = "sarah.db"
 
 def connect_db():
-    return sqlite3.connect(DB_PATH)
+    return get_connection(DB_PATH)
 
 # -----------------------
 # Core multi-client operations
@@ -38,6 +41,10 @@ def client_report(name):
         "invoice_count": invoice_count
     }
 
+def client_reports(clients=None):
+    """All client reports in one grouped query, keyed by client name."""
+    return _client_reports(DB_PATH, clients)
+
 def overdue_clients(days=30):
     cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
     conn = connect_db()
@@ -66,12 +73,7 @@ def high_value_clients(threshold=1000):
 
 def search_clients(keyword):
     conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT client_name, description, type, amount FROM ledger
-        WHERE client_name LIKE ? OR description LIKE ?
-    """, (f"%{keyword}%", f"%{keyword}%"))
-    result = cursor.fetchall()
+    result = search_ledger(conn, keyword)
     conn.close()
     return result
 
@@ -84,18 +86,13 @@ def notify_overdue():
         print(f"ALERT: {entry['client']} has overdue balance of {entry['amount']}")
 
 def send_followups_and_priority():
-    clients = get_all_clients()
-    high_value = high_value_clients()
-    high_value_names = [c['client'] for c in high_value]
+    high_value = {c['client']: c['total_invoiced'] for c in high_value_clients()}
 
-    for client in clients:
-        report = client_report(client)
+    for client, report in client_reports().items():
         if report["balance"] > 0:
-            percent_paid = (report["paid"] / report["invoiced"] * 100) if report["invoiced"] else 0
-            print(f"FOLLOW-UP: {client} has outstanding balance {report['balance']:.2f} ({percent_paid:.1f}% paid)")
-        if client in high_value_names:
-            total = next(c['total_invoiced'] for c in high_value if c['client'] == client)
-            print(f"PRIORITY ALERT: {client} is high-value with total invoiced {total:.2f}")
+            print(f"FOLLOW-UP: {client} has outstanding balance {report['balance']:.2f} ({report['payment_pct']:.1f}% paid)")
+        if client in high_value:
+            print(f"PRIORITY ALERT: {client} is high-value with total invoiced {high_value[client]:.2f}")
 
 if __name__ == "__main__":
     print("Day 7 multi-client system loaded.")
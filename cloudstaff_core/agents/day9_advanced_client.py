@@ -1,10 +1,13 @@
-import sqlite3
 from datetime import datetime, timedelta
 
+from cloudstaff_core.agents.reporting import client_reports as _client_reports
+from cloudstaff_core.storage.connection_pool import get_connection
+from cloudstaff_core.storage.ledger_search import search_ledger
+
 DB_PATH = "sarah.db"
 
 def connect_db():
-    return sqlite3.connect(DB_PATH)
+    return get_connection(DB_PATH)
 
 # -----------------------
 # Multi-client core operations
@@ -44,6 +47,13 @@ def get_invoice_count(name):
     conn.close()
     return count
 
+def client_reports(clients=None):
+    """All client reports in one grouped query, keyed by client name."""
+    reports = _client_reports(DB_PATH, clients)
+    for report in reports.values():
+        report["avg_invoice"] = round(report["avg_invoice"], 2)
+    return reports
+
 def overdue_clients(days=30):
     cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
     conn = connect_db()
@@ -78,12 +88,7 @@ def high_value_clients(threshold=1000):
 # -----------------------
 def search_clients(keyword):
     conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT client_name, description, type, amount FROM ledger
-        WHERE client_name LIKE ? OR description LIKE ?
-    """, (f"%{keyword}%", f"%{keyword}%"))
-    result = cursor.fetchall()
+    result = search_ledger(conn, keyword)
     conn.close()
     return result
 
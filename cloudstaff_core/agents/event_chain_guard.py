@@ -1,40 +1,29 @@
 import json
-import hashlib
 import shutil
 from pathlib import Path
 
+from cloudstaff_core.storage.event_chain import (
+    canonical_event_string,
+    sha256,
+    split_chunks,
+    verify_chunks,
+)
+
 EVENTS_PATH = Path("cloudstaff_core/storage/events/events.jsonl")
 BACKUP_PATH = Path("cloudstaff_core/storage/events/events.backup.chain.jsonl")
 
 
-def sha256(data: str) -> str:
-    return hashlib.sha256(data.encode("utf-8")).hexdigest()
-
-
-def canonical_event_string(event: dict) -> str:
-    """
-    Produce a deterministic string for hashing.
-    Excludes hash fields themselves.
-    """
-    filtered = {
-        k: event[k]
-        for k in sorted(event.keys())
-        if k not in ("event_hash", "prev_hash")
-    }
-    return json.dumps(filtered, sort_keys=True, separators=(",", ":"))
-
-
-def chain_events():
-    if not EVENTS_PATH.exists():
+def chain_events(path: Path = EVENTS_PATH, backup_path: Path = BACKUP_PATH):
+    if not path.exists():
         raise RuntimeError("Events file does not exist")
 
     # Backup first (non-negotiable)
-    shutil.copy(EVENTS_PATH, BACKUP_PATH)
+    shutil.copy(path, backup_path)
 
     chained_events = []
     prev_hash = "GENESIS"
 
-    with EVENTS_PATH.open("r", encoding="utf-8") as f:
+    with path.open("r", encoding="utf-8") as f:
         for line_number, line in enumerate(f, start=1):
             event = json.loads(line)
 
@@ -49,12 +38,25 @@ def chain_events():
             chained_events.append(event)
 
     # Rewrite file atomically
-    with EVENTS_PATH.open("w", encoding="utf-8") as f:
+    with path.open("w", encoding="utf-8") as f:
         for event in chained_events:
             f.write(json.dumps(event, separators=(",", ":")) + "\n")
 
     print("EVENT CHAINING COMPLETE")
-    print(f"Backup written to {BACKUP_PATH}")
+    print(f"Backup written to {backup_path}")
+
+
+def verify_chain(parallel=None, path: Path = EVENTS_PATH) -> dict:
+    """
+    Read-only chain verification. parallel=N recomputes hashes in N
+    worker processes (4 chunks per worker to even out stragglers).
+    """
+    if not path.exists():
+        raise RuntimeError("Events file does not exist")
+
+    workers = parallel if parallel and parallel > 1 else 1
+    chunks = split_chunks(path, workers * 4 if workers > 1 else 1)
+    return verify_chunks(chunks, parallel=workers)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,20 @@
 import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+from cloudstaff_core.storage.event_chain import split_chunks
+from cloudstaff_core.storage.mmap_reader import iter_lines
+
 EVENTS_PATH = Path("cloudstaff_core/storage/events/events.jsonl")
 BACKUP_PATH = Path("cloudstaff_core/storage/events/events.backup.jsonl")
 
+TMP_SUFFIX = ".normalizing"
+CHECKPOINT_SUFFIX = ".normalize.checkpoint.json"
+CHECKPOINT_EVERY = 10_000  # lines between progress checkpoints
+
 ALLOWED_ACTIONS = {
     "Invoice issued": "INVOICE",
     "Payment received": "PAYMENT",
@@ -26,25 +36,163 @@ def normalize_event(raw):
         "source": "normalized_migration"
     }
 
-def normalize_events():
-    if not EVENTS_PATH.exists():
+# -------------------------------------
+# CHECKPOINTS
+# -------------------------------------
+def _source_stamp(path: Path) -> dict:
+    st = path.stat()
+    return {"source_size": st.st_size, "source_mtime_ns": st.st_mtime_ns}
+
+
+def _load_checkpoint(path: Path, tmp_path: Path, checkpoint_path: Path):
+    """A saved checkpoint, if the source is unchanged and the temp output is intact."""
+    if not checkpoint_path.exists() or not tmp_path.exists():
+        return None
+    try:
+        checkpoint = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+    stamp = _source_stamp(path)
+    if any(checkpoint.get(k) != v for k, v in stamp.items()):
+        return None
+    if tmp_path.stat().st_size < checkpoint["out_offset"]:
+        return None
+    return checkpoint
+
+
+def _save_checkpoint(checkpoint: dict, checkpoint_path: Path):
+    tmp = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+    tmp.write_text(json.dumps(checkpoint, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, checkpoint_path)
+
+
+# -------------------------------------
+# SERIAL STREAM
+# -------------------------------------
+def _normalize_serial(path, tmp_path, checkpoint_path, checkpoint, checkpoint_every):
+    stamp = _source_stamp(path)
+    line = checkpoint["line"] if checkpoint else 0
+    in_offset = checkpoint["in_offset"] if checkpoint else 0
+    out_offset = checkpoint["out_offset"] if checkpoint else 0
+
+    with open(tmp_path, "r+b" if checkpoint else "wb") as out:
+        out.truncate(out_offset)  # drop anything written after the checkpoint
+        out.seek(out_offset)
+
+        def save():
+            out.flush()
+            os.fsync(out.fileno())
+            _save_checkpoint(
+                dict(stamp, line=line, in_offset=in_offset, out_offset=out.tell()),
+                checkpoint_path,
+            )
+
+        for _, end, view in iter_lines(path, in_offset):
+            try:
+                event = normalize_event(json.loads(bytes(view)))
+            except Exception as e:
+                save()  # resumable once normalize_event handles this line
+                raise RuntimeError(f"Failed at line {line + 1}: {e}")
+
+            out.write(json.dumps(event).encode("utf-8") + b"\n")
+            line += 1
+            in_offset = end
+            if line % checkpoint_every == 0:
+                save()
+
+        out.flush()
+        os.fsync(out.fileno())
+    return line
+
+
+# -------------------------------------
+# PARALLEL CHUNKS
+# -------------------------------------
+def _normalize_chunk(path, start, end, part_path):
+    """Normalizes bytes [start, end) of the log into part_path."""
+    lines = 0
+    with open(part_path, "wb") as out:
+        for offset, _, view in iter_lines(path, start):
+            if offset >= end:
+                break
+            try:
+                event = normalize_event(json.loads(bytes(view)))
+            except Exception as e:
+                return {"lines": lines, "error": (lines + 1, str(e))}
+            out.write(json.dumps(event).encode("utf-8") + b"\n")
+            lines += 1
+    return {"lines": lines, "error": None}
+
+
+def _normalize_parallel(path, tmp_path, parallel):
+    chunks = split_chunks(path, parallel * 4)
+    parts = [tmp_path.with_name(f"{tmp_path.name}.part{i}") for i in range(len(chunks))]
+
+    try:
+        # map() keeps chunk order; each worker streams into its own part file
+        with ProcessPoolExecutor(max_workers=parallel) as pool:
+            results = list(pool.map(_normalize_chunk, *zip(*chunks), parts))
+
+        lines = 0
+        for result in results:
+            if result["error"]:
+                local_line, message = result["error"]
+                raise RuntimeError(f"Failed at line {lines + local_line}: {message}")
+            lines += result["lines"]
+
+        with open(tmp_path, "wb") as out:
+            for part in parts:
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out)
+            out.flush()
+            os.fsync(out.fileno())
+    finally:
+        for part in parts:
+            if part.exists():
+                part.unlink()
+    return lines
+
+
+def normalize_events(
+    events_path: Path = EVENTS_PATH,
+    backup_path: Path = BACKUP_PATH,
+    parallel=None,
+    resume: bool = True,
+    checkpoint_every: int = CHECKPOINT_EVERY,
+):
+    """
+    Rewrites the log in canonical form with constant memory.
+
+    Events stream from the log into <log>.normalizing, which replaces
+    the log atomically once complete (after the backup copy is taken).
+    Serial runs checkpoint their progress every `checkpoint_every` lines
+    and on failure; a rerun against the unchanged source resumes there.
+    parallel=N normalizes chunks in N worker processes instead and
+    always starts from scratch.
+    """
+    events_path = Path(events_path)
+    if not events_path.exists():
         raise FileNotFoundError("events.jsonl not found")
 
-    raw_lines = EVENTS_PATH.read_text().splitlines()
-    normalized = []
+    tmp_path = events_path.with_name(events_path.name + TMP_SUFFIX)
+    checkpoint_path = events_path.with_name(events_path.name + CHECKPOINT_SUFFIX)
 
-    for idx, line in enumerate(raw_lines, start=1):
-        try:
-            raw = json.loads(line)
-            normalized.append(normalize_event(raw))
-        except Exception as e:
-            raise RuntimeError(f"Failed at line {idx}: {e}")
+    if parallel and parallel > 1:
+        lines = _normalize_parallel(events_path, tmp_path, parallel)
+    else:
+        checkpoint = _load_checkpoint(events_path, tmp_path, checkpoint_path) if resume else None
+        if checkpoint:
+            print(f"Resuming at line {checkpoint['line'] + 1}")
+        lines = _normalize_serial(events_path, tmp_path, checkpoint_path, checkpoint, checkpoint_every)
 
-    BACKUP_PATH.write_text("\n".join(raw_lines) + "\n")
-    EVENTS_PATH.write_text("\n".join(json.dumps(e) for e in normalized) + "\n")
+    shutil.copyfile(events_path, backup_path)
+    os.replace(tmp_path, events_path)
+    if checkpoint_path.exists():
+        checkpoint_path.unlink()
 
     print("EVENT NORMALIZATION COMPLETE")
-    print(f"Backup written to {BACKUP_PATH}")
+    print(f"Backup written to {backup_path}")
+    return lines
 
 if __name__ == "__main__":
     normalize_events()
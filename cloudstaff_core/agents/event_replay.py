@@ -1,21 +1,19 @@
 import json
-import hashlib
+import os
 from pathlib import Path
+from time import perf_counter
 
-EVENTS_PATH = Path("cloudstaff_core/storage/events/events.jsonl")
-
-
-def sha256(data: str) -> str:
-    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+from cloudstaff_core.runtime import metrics
+from cloudstaff_core.storage.event_chain import canonical_event_string, sha256
+from cloudstaff_core.storage.mmap_reader import iter_lines
 
+EVENTS_PATH = Path("cloudstaff_core/storage/events/events.jsonl")
+CHECKPOINT_PATH = Path("cloudstaff_core/storage/events/replay.checkpoint.json")
 
-def canonical_event_string(event: dict) -> str:
-    filtered = {
-        k: event[k]
-        for k in sorted(event.keys())
-        if k not in ("event_hash", "prev_hash")
-    }
-    return json.dumps(filtered, sort_keys=True, separators=(",", ":"))
+REPLAYED_EVENTS = metrics.counter("replay_events_total", "Events verified and applied by replay")
+HASHED_BYTES = metrics.counter("replay_hashed_bytes_total", "Bytes fed to sha256 while verifying the chain")
+REPLAY_SECONDS = metrics.histogram("replay_seconds", "Duration of one advance_checkpoint pass")
+REPLAY_RATE = metrics.gauge("replay_events_per_second", "Throughput of the last replay pass")
 
 
 def resolve_client(event: dict, line: int) -> str:
@@ -64,37 +62,158 @@ def semantic_apply(event: dict, state: dict, line: int):
         )
 
 
-def replay_events():
-    if not EVENTS_PATH.exists():
-        raise RuntimeError("Events file missing")
+GENESIS_CHECKPOINT = {
+    "offset": 0,
+    "line": 0,
+    "last_line_offset": 0,
+    "last_hash": "GENESIS",
+    "state": {},
+}
+
+
+def load_checkpoint(path: Path = CHECKPOINT_PATH):
+    if not path.exists():
+        return None
+
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None  # unreadable checkpoints are rebuilt, never trusted
+
+
+def save_checkpoint(checkpoint: dict, path: Path = CHECKPOINT_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, sort_keys=True, separators=(",", ":"))
 
-    state = {}
-    prev_hash = "GENESIS"
+    os.replace(tmp_path, path)
 
-    with EVENTS_PATH.open("r", encoding="utf-8") as f:
-        for index, line in enumerate(f, start=1):
-            event = json.loads(line)
 
-            if "event_hash" not in event or "prev_hash" not in event:
-                raise RuntimeError(
-                    f"INTEGRITY FAILURE: Missing hash fields at line {index}"
-                )
+def checkpoint_is_valid(checkpoint: dict, events_path: Path = EVENTS_PATH) -> bool:
+    """
+    A checkpoint is only reusable if the log still holds the verified
+    prefix: the line it ended on must sit at the same byte range and
+    carry the same event_hash. Rewrites (normalizer, chain guard) and
+    truncation both fail this check.
+    """
+
+    offset = checkpoint["offset"]
+    if offset == 0:
+        return True
+
+    if events_path.stat().st_size < offset:
+        return False
+
+    start = checkpoint["last_line_offset"]
+    with events_path.open("rb") as f:
+        f.seek(start)
+        raw = f.read(offset - start)
+
+    try:
+        event = json.loads(raw)
+    except ValueError:
+        return False
+
+    return isinstance(event, dict) and event.get("event_hash") == checkpoint["last_hash"]
+
+
+def advance_checkpoint(checkpoint: dict, events_path: Path = EVENTS_PATH, end: int = None) -> dict:
+    """
+    Verifies and applies every line after the checkpoint, up to byte
+    offset `end` when given. Returns a new checkpoint; the one passed
+    in is left untouched.
+    """
+
+    start = perf_counter() if metrics.ENABLED else None
+    hashed = 0
+
+    state = dict(checkpoint["state"])
+    prev_hash = checkpoint["last_hash"]
+    offset = checkpoint["offset"]
+    last_line_offset = checkpoint["last_line_offset"]
+    index = checkpoint["line"]
+
+    for line_offset, line_end, view in iter_lines(events_path, offset):
+        if end is not None and line_offset >= end:
+            break
+        index += 1
+        event = json.loads(bytes(view))
+
+        if "event_hash" not in event or "prev_hash" not in event:
+            raise RuntimeError(
+                f"INTEGRITY FAILURE: Missing hash fields at line {index}"
+            )
+
+        if event["prev_hash"] != prev_hash:
+            raise RuntimeError(
+                f"CHAIN BREAK at line {index}: "
+                f"expected {prev_hash}, found {event['prev_hash']}"
+            )
+
+        event_str = canonical_event_string(event)
+        expected_hash = sha256(prev_hash + event_str)
+        if start is not None:
+            hashed += len(prev_hash) + len(event_str)
+
+        if event["event_hash"] != expected_hash:
+            raise RuntimeError(
+                f"TAMPER DETECTED at line {index}: hash mismatch"
+            )
+
+        semantic_apply(event, state, index)
+        prev_hash = event["event_hash"]
+        last_line_offset = line_offset
+        offset = line_end
+
+    if start is not None:
+        seconds = perf_counter() - start
+        events = index - checkpoint["line"]
+        REPLAYED_EVENTS.inc(amount=events)
+        HASHED_BYTES.inc(amount=hashed)
+        REPLAY_SECONDS.observe(seconds)
+        if events and seconds:
+            REPLAY_RATE.set(events / seconds)
+
+    return {
+        "offset": offset,
+        "line": index,
+        "last_line_offset": last_line_offset,
+        "last_hash": prev_hash,
+        "state": state,
+    }
+
+
+def replay_checkpoint(
+    full: bool = False,
+    events_path: Path = EVENTS_PATH,
+    checkpoint_path: Path = CHECKPOINT_PATH,
+) -> dict:
+    """
+    Resumes from the stored checkpoint when it still matches the log,
+    otherwise replays from GENESIS. full=True forces the latter.
+    """
+
+    if not events_path.exists():
+        raise RuntimeError("Events file missing")
+
+    checkpoint = None if full else load_checkpoint(checkpoint_path)
+    if checkpoint is None or not checkpoint_is_valid(checkpoint, events_path):
+        checkpoint = GENESIS_CHECKPOINT
 
-            if event["prev_hash"] != prev_hash:
-                raise RuntimeError(
-                    f"CHAIN BREAK at line {index}: "
-                    f"expected {prev_hash}, found {event['prev_hash']}"
-                )
+    advanced = advance_checkpoint(checkpoint, events_path)
 
-            event_str = canonical_event_string(event)
-            expected_hash = sha256(prev_hash + event_str)
+    if advanced["offset"] != checkpoint["offset"] or checkpoint is GENESIS_CHECKPOINT:
+        save_checkpoint(advanced, checkpoint_path)
 
-            if event["event_hash"] != expected_hash:
-                raise RuntimeError(
-                    f"TAMPER DETECTED at line {index}: hash mismatch"
-                )
+    return advanced
 
-            semantic_apply(event, state, index)
-            prev_hash = event["event_hash"]
 
-    return state
+def replay_events(
+    full: bool = False,
+    events_path: Path = EVENTS_PATH,
+    checkpoint_path: Path = CHECKPOINT_PATH,
+):
+    return replay_checkpoint(full, events_path, checkpoint_path)["state"]
@@ -4,40 +4,218 @@
 # Stateless, Deterministic, No Policy Logic
 # =========================================
 
+import json
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
+from time import perf_counter
 import os
 
+from cloudstaff_core.agents.state_cache import MISSING, StateCache
+from cloudstaff_core.runtime import metrics
+from cloudstaff_core.storage.connection_pool import open_connection
+from cloudstaff_core.storage.ledger_schema import migrate_fts, migrate_indexes
+
 DB_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "sarah.db")
 
+LEDGER_WRITES = metrics.counter(
+    "sarah_ledger_writes_total", "Ledger rows written by Sarah", ("transaction_type",)
+)
+PERSIST_SECONDS = metrics.histogram(
+    "sarah_persist_seconds", "Sarah._persist latency, commit included", ("transaction_type",)
+)
+READ_SECONDS = metrics.histogram(
+    "sarah_read_seconds", "Sarah read model latency", ("model",)
+)
+STATE_LOOKUPS = metrics.counter(
+    "sarah_state_lookups_total", "Last-state lookups by state cache result", ("result",)
+)
+
 
 class Sarah:
-    def __init__(self):
-        self.conn = sqlite3.connect(DB_FILE)
-        self.conn.row_factory = sqlite3.Row
+    # One state cache per ledger file, shared by every Sarah in the process
+    _state_caches = {}
+
+    def __init__(self, db_file: str = DB_FILE):
+        # Private connection: batch() holds a transaction open while other
+        # code (dayN helpers, reporting) uses the shared pooled one
+        self.conn = open_connection(db_file)
+        self._in_batch = False
+        self._pending_states = {}  # this batch's writes, kept out of the shared cache until commit
+        migrate_indexes(self.conn)
+        migrate_fts(self.conn)
+        self._ensure_balances()
+        self._states = self._state_cache(db_file)
+        self._data_version = self._read_data_version()
+
+    def _state_cache(self, db_file: str):
+        key = os.path.abspath(db_file)
+        cache = self._state_caches.get(key)
+        if cache is None:
+            cache = self._state_caches.setdefault(key, StateCache())
+        else:
+            # Nothing tracked writes since the last instance looked
+            cache.invalidate()
+        cache.warm(self.conn)
+        return cache
+
+    def _read_data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _sync_states(self):
+        """
+        Drops the shared state cache if another connection committed
+        since we last looked: dayN helpers, other processes or another
+        Sarah. data_version does not move for our own commits.
+        """
+        version = self._read_data_version()
+        if version != self._data_version:
+            self._data_version = version
+            self._states.invalidate()
+
+    def _cursor(self):
+        # Row access by name, without changing the shared connection
+        c = self.conn.cursor()
+        c.row_factory = sqlite3.Row
+        return c
+
+    # -------------------------------------
+    # MATERIALIZED BALANCES
+    # -------------------------------------
+    def _ensure_balances(self):
+        c = self._cursor()
+        c.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'client_balances'"
+        )
+        if c.fetchone():
+            return
+
+        c.execute(
+            """
+            CREATE TABLE client_balances (
+                client_name TEXT PRIMARY KEY,
+                invoiced REAL,
+                paid REAL
+            )
+            """
+        )
+        self.rebuild_balances()
+
+    def rebuild_balances(self):
+        """
+        Recomputes client_balances from the ledger in one transaction.
+        Rows are folded in id order, matching the incremental updates.
+        """
+        c = self._cursor()
+        c.execute("DELETE FROM client_balances")
+        c.execute(
+            "SELECT client_name, transaction_type, amount FROM ledger ORDER BY id"
+        )
+
+        # NULL means "no rows of this type", mirroring sum() over nothing
+        balances = {}
+        for r in c.fetchall():
+            if r["transaction_type"] not in ("INVOICE", "PAYMENT"):
+                continue
+            b = balances.setdefault(r["client_name"], [None, None])
+            i = 0 if r["transaction_type"] == "INVOICE" else 1
+            b[i] = r["amount"] if b[i] is None else b[i] + r["amount"]
+
+        c.executemany(
+            "INSERT INTO client_balances (client_name, invoiced, paid) VALUES (?, ?, ?)",
+            [(name, b[0], b[1]) for name, b in balances.items()],
+        )
+        self.conn.commit()
+        return len(balances)
 
     # -------------------------------------
     # READ MODELS
     # -------------------------------------
     def get_last_state(self, client_name: str):
-        c = self.conn.cursor()
+        if client_name in self._pending_states:
+            return self._pending_states[client_name]
+
+        self._sync_states()
+        state = self._states.get(client_name)
+        if state is not MISSING:
+            if metrics.ENABLED:
+                STATE_LOOKUPS.inc("hit")
+            return state
+
+        if metrics.ENABLED:
+            STATE_LOOKUPS.inc("miss")
+
+        c = self._cursor()
         c.execute(
             "SELECT state FROM ledger WHERE client_name = ? ORDER BY id DESC LIMIT 1",
             (client_name,),
         )
         row = c.fetchone()
-        return row["state"] if row else None
+        state = row["state"] if row else None
+        self._states.put(client_name, state)
+        return state
 
-    def get_financials(self, client_name: str):
-        c = self.conn.cursor()
+    @metrics.timed(READ_SECONDS, "last_states")
+    def get_last_states(self, client_names):
+        """Bulk get_last_state: {client_name: state}, None for unknown clients."""
+        states, misses = {}, []
+        self._sync_states()
+        for name in client_names:
+            state = self._pending_states.get(name, MISSING)
+            if state is MISSING:
+                state = self._states.get(name)
+            if state is MISSING:
+                misses.append(name)
+            else:
+                states[name] = state
+        if metrics.ENABLED:
+            STATE_LOOKUPS.inc("hit", amount=len(states))
+            STATE_LOOKUPS.inc("miss", amount=len(misses))
+        if not misses:
+            return states
+
+        c = self._cursor()
         c.execute(
-            "SELECT transaction_type, amount FROM ledger WHERE client_name = ?",
-            (client_name,),
+            """
+            SELECT client_name, state FROM ledger WHERE id IN (
+                SELECT MAX(id) FROM ledger
+                WHERE client_name IN (SELECT value FROM json_each(?))
+                GROUP BY client_name
+            )
+            """,
+            (json.dumps(misses),),
         )
-        rows = c.fetchall()
+        loaded = dict.fromkeys(misses)
+        loaded.update((r["client_name"], r["state"]) for r in c.fetchall())
+        for name, state in loaded.items():
+            self._states.put(name, state)
+        states.update(loaded)
+        return states
 
-        invoiced = sum(r["amount"] for r in rows if r["transaction_type"] == "INVOICE")
-        paid = sum(r["amount"] for r in rows if r["transaction_type"] == "PAYMENT")
+    @metrics.timed(READ_SECONDS, "balances")
+    def get_balances(self, client_names):
+        """
+        Raw client_balances rows: {client_name: [invoiced, paid]}, where
+        None means no rows of that type. See financials().
+        """
+        names = list(client_names)
+        c = self._cursor()
+        c.execute(
+            """
+            SELECT client_name, invoiced, paid FROM client_balances
+            WHERE client_name IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps(names),),
+        )
+        balances = {name: [None, None] for name in names}
+        for r in c.fetchall():
+            balances[r["client_name"]] = [r["invoiced"], r["paid"]]
+        return balances
+
+    @staticmethod
+    def financials(invoiced, paid):
+        invoiced = invoiced if invoiced is not None else 0
+        paid = paid if paid is not None else 0
 
         return {
             "invoiced": invoiced,
@@ -45,6 +223,47 @@ class Sarah:
             "balance": invoiced - paid,
         }
 
+    @metrics.timed(READ_SECONDS, "financials")
+    def get_financials(self, client_name: str):
+        c = self._cursor()
+        c.execute(
+            "SELECT invoiced, paid FROM client_balances WHERE client_name = ?",
+            (client_name,),
+        )
+        row = c.fetchone()
+        if not row:
+            return self.financials(None, None)
+        return self.financials(row["invoiced"], row["paid"])
+
+    # -------------------------------------
+    # TRANSACTIONS
+    # -------------------------------------
+    @contextmanager
+    def batch(self):
+        """
+        Defers the per-write commit so every _persist inside the block
+        lands in one transaction; rolled back if the block raises.
+        Nested blocks join the outer one. State cache updates are held
+        back until the commit and dropped on rollback.
+        """
+        if self._in_batch:
+            yield self
+            return
+
+        self._in_batch = True
+        try:
+            yield self
+        except BaseException:
+            self.conn.rollback()
+            raise
+        else:
+            self.conn.commit()
+            for client_name, state in self._pending_states.items():
+                self._states.put(client_name, state)
+        finally:
+            self._pending_states.clear()
+            self._in_batch = False
+
     # -------------------------------------
     # LEDGER WRITE (NO VALIDATION)
     # -------------------------------------
@@ -57,7 +276,8 @@ class Sarah:
         description: str,
         notes: str = "",
     ):
-        c = self.conn.cursor()
+        start = perf_counter() if metrics.ENABLED else None
+        c = self._cursor()
         c.execute(
             """
             INSERT INTO ledger
@@ -74,7 +294,27 @@ class Sarah:
                 description,
             ),
         )
-        self.conn.commit()
+
+        if transaction_type in ("INVOICE", "PAYMENT"):
+            column = "invoiced" if transaction_type == "INVOICE" else "paid"
+            c.execute(
+                f"""
+                INSERT INTO client_balances (client_name, {column}) VALUES (?, ?)
+                ON CONFLICT(client_name)
+                DO UPDATE SET {column} = COALESCE({column}, 0) + excluded.{column}
+                """,
+                (client_name, amount),
+            )
+
+        if self._in_batch:
+            self._pending_states[client_name] = state
+        else:
+            self.conn.commit()
+            self._states.put(client_name, state)
+
+        if start is not None:
+            LEDGER_WRITES.inc(transaction_type)
+            PERSIST_SECONDS.observe(perf_counter() - start, transaction_type)
 
     # -------------------------------------
     # COMMAND EXECUTION (ASSUMED LEGAL)
@@ -103,8 +343,10 @@ class Sarah:
     # REPORTING
     # -------------------------------------
     def report_client(self, name: str):
-        f = self.get_financials(name)
+        return self.format_report(name, self.get_financials(name))
 
+    @staticmethod
+    def format_report(name: str, f: dict):
         if f["invoiced"] == 0 and f["paid"] == 0:
             return f"No records for {name}."
 
@@ -0,0 +1,77 @@
+# cloudstaff_core/agents/state_cache.py
+# =========================================
+# Per-client workflow state cache
+# =========================================
+
+import threading
+from collections import OrderedDict
+
+MISSING = object()  # not cached; distinct from a cached None (no ledger rows)
+
+DEFAULT_MAXSIZE = 50_000
+
+
+class StateCache:
+    """
+    Bounded LRU of client_name -> last workflow state.
+
+    Write-through: Sarah updates the entry once each ledger write is
+    committed (at the end of a batch() for batched writes). Writes that
+    bypass Sarah (dayN helpers, other processes) are caught by Sarah
+    checking PRAGMA data_version before each lookup, which invalidates
+    the cache when another connection has committed.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._states)
+
+    def get(self, client_name: str):
+        # Lock-free: single OrderedDict operations are atomic under the GIL
+        state = self._states.get(client_name, MISSING)
+        if state is not MISSING:
+            try:
+                self._states.move_to_end(client_name)
+            except KeyError:
+                pass  # evicted by a concurrent put
+        return state
+
+    def put(self, client_name: str, state):
+        with self._lock:
+            self._states[client_name] = state
+            self._states.move_to_end(client_name)
+            while len(self._states) > self.maxsize:
+                self._states.popitem(last=False)
+
+    def invalidate(self, client_name: str = None):
+        with self._lock:
+            if client_name is None:
+                self._states.clear()
+            else:
+                self._states.pop(client_name, None)
+
+    def warm(self, conn):
+        """
+        Loads the latest state of the most recently active clients
+        (up to maxsize) in one grouped query. Returns the count.
+        """
+        rows = conn.execute(
+            """
+            SELECT client_name, state FROM ledger WHERE id IN (
+                SELECT MAX(id) FROM ledger GROUP BY client_name
+            )
+            ORDER BY id DESC
+            LIMIT ?
+            """,
+            (self.maxsize,),
+        ).fetchall()
+
+        with self._lock:
+            for client_name, state in reversed(rows):  # most recent ends up MRU
+                self._states[client_name] = state
+                self._states.move_to_end(client_name)
+        return len(rows)
@@ -1,4 +1,5 @@
-from typing import Dict, Set
+from collections import deque
+from typing import Dict, Iterable, Optional, Set
 
 
 STATE_TRANSITIONS: Dict[str, Set[str]] = {
@@ -27,3 +28,90 @@ STATE_TRANSITIONS: Dict[str, Set[str]] = {
     },
 }
 
+# State each controller command moves to; others leave it unchanged
+STATE_EFFECTS: Dict[str, str] = {
+    "client_intake": "intake_completed",
+    "schedule_meeting": "meeting_scheduled",
+    "send_follow_up": "follow_up_sent",
+    "reset": "idle",
+}
+
+DENIED = -1
+
+
+class StateMachine:
+    """
+    Transition table compiled to integer indexes.
+
+    States and actions are numbered once; matrix[state][action] holds
+    the index of the next state, or DENIED. An allowed action without
+    an entry in `effects` keeps the current state.
+    """
+
+    def __init__(self, transitions: Dict[Optional[str], Iterable[str]],
+                 effects: Optional[Dict[str, str]] = None):
+        effects = dict(effects or {})
+
+        self.states = list(transitions)
+        for target in effects.values():
+            if target not in transitions:
+                self.states.append(target)
+        self.actions = sorted({a for actions in transitions.values() for a in actions} | set(effects))
+
+        self.state_index = {s: i for i, s in enumerate(self.states)}
+        self.action_index = {a: j for j, a in enumerate(self.actions)}
+
+        self.matrix = []
+        for state in self.states:
+            allowed = transitions.get(state, ())
+            row = [DENIED] * len(self.actions)
+            for action in allowed:
+                row[self.action_index[action]] = self.state_index[effects.get(action, state)]
+            self.matrix.append(tuple(row))
+
+        # (state, action) -> next state, the hot-path form of the matrix
+        self.table = {
+            (state, action): self.states[target]
+            for state, row in zip(self.states, self.matrix)
+            for action, target in zip(self.actions, row)
+            if target != DENIED
+        }
+
+    def allows(self, state, action) -> bool:
+        return (state, action) in self.table
+
+    def next_state(self, state, action):
+        """State after `action`; KeyError if the action is not allowed."""
+        return self.table[(state, action)]
+
+    def dispatch_table(self, handlers: Dict[str, object]) -> dict:
+        """
+        (state, action) -> handler for every allowed transition, so one
+        dict lookup both validates a command and finds its handler.
+        """
+        missing = sorted({action for _, action in self.table} - set(handlers))
+        if missing:
+            raise ValueError(f"No handler for allowed actions: {missing}")
+        return {key: handlers[key[1]] for key in self.table}
+
+    def allowed_actions(self, state) -> list:
+        i = self.state_index.get(state)
+        if i is None:
+            return []
+        return [a for a, target in zip(self.actions, self.matrix[i]) if target != DENIED]
+
+    def reachable_states(self, start) -> list:
+        """States reachable from `start` (inclusive), in declaration order."""
+        if start not in self.state_index:
+            return []
+        seen = {self.state_index[start]}
+        queue = deque(seen)
+        while queue:
+            for target in self.matrix[queue.popleft()]:
+                if target != DENIED and target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return [s for i, s in enumerate(self.states) if i in seen]
+
+
+CONTROLLER_MACHINE = StateMachine(STATE_TRANSITIONS, STATE_EFFECTS)
@@ -0,0 +1,283 @@
+# cloudstaff_core/benchmarks/run_benchmarks.py
+# =========================================
+# Throughput / latency suite over a synthetic ledger
+# =========================================
+# Builds a throwaway ledger, event log and KB from a deterministic
+# workload, times the hot paths, and writes p50/p95/p99 and ops/sec
+# as JSON. With a baseline, any case that got slower than the
+# tolerance allows is reported and the exit status is 1.
+#
+#   python -m cloudstaff_core.benchmarks.run_benchmarks
+#   python -m cloudstaff_core.benchmarks.run_benchmarks --clients 5000 --events 100000
+#   python -m cloudstaff_core.benchmarks.run_benchmarks --save-baseline
+#
+# The dayN_stress_test.py scripts remain as smoke runs; this is the
+# place to look for numbers.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from cloudstaff_core.agents import day10_advanced_client
+from cloudstaff_core.agents.event_chain_guard import chain_events
+from cloudstaff_core.agents.event_replay import replay_events
+from cloudstaff_core.agents.sarah import Sarah
+from cloudstaff_core.benchmarks.workload import (
+    DEFAULT_WORKLOAD,
+    create_kb,
+    create_ledger,
+    generate_commands,
+    generate_events,
+    kb_queries,
+    make_workload,
+    sample_clients,
+    write_event_log,
+)
+from cloudstaff_core.commands.command_router import CommandRouter
+from cloudstaff_core.experiments.kb_embeddings import HashingEmbeddingBackend
+from cloudstaff_core.experiments.sarah_task7_kb_search import search_kb
+from cloudstaff_core.storage.connection_pool import close_thread_connections
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_REPEATS = 5        # passes over the whole log for replay/chain cases
+DEFAULT_TOLERANCE = 0.25   # allowed slowdown before a case is a regression
+
+
+# -------------------------------------
+# MEASUREMENT
+# -------------------------------------
+def percentile(ordered, pct):
+    # Nearest-rank on already sorted samples
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples_ns, units_per_op=1):
+    """
+    Latency percentiles in microseconds plus throughput. units_per_op
+    is how many items (events, rows) one timed call handled.
+    """
+    ordered = sorted(samples_ns)
+    total_s = sum(ordered) / 1e9
+    summary = {
+        "ops": len(ordered),
+        "p50_us": percentile(ordered, 50) / 1e3,
+        "p95_us": percentile(ordered, 95) / 1e3,
+        "p99_us": percentile(ordered, 99) / 1e3,
+        "mean_us": total_s / len(ordered) * 1e6,
+        "ops_per_sec": len(ordered) / total_s if total_s else 0.0,
+    }
+    if units_per_op != 1:
+        summary["units_per_op"] = units_per_op
+        summary["units_per_sec"] = summary["ops_per_sec"] * units_per_op
+    return summary
+
+
+def time_calls(fn, args):
+    samples = []
+    clock = time.perf_counter_ns
+    for arg in args:
+        start = clock()
+        fn(arg)
+        samples.append(clock() - start)
+    return samples
+
+
+@contextlib.contextmanager
+def day10_db(path):
+    # The dayN modules read their ledger path from a module constant
+    original = day10_advanced_client.DB_PATH
+    day10_advanced_client.DB_PATH = path
+    try:
+        yield day10_advanced_client
+    finally:
+        day10_advanced_client.DB_PATH = original
+
+
+# -------------------------------------
+# CASES
+# -------------------------------------
+def bench_ledger(workload, tmp):
+    db_path = os.path.join(tmp, "ledger.db")
+    create_ledger(db_path)
+
+    router = CommandRouter(db_path)
+    results = {"router_execute": summarize(time_calls(router.execute, generate_commands(workload)))}
+
+    # The dayN reports read the type column; Sarah leaves it at its default
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "UPDATE ledger SET type = CASE transaction_type "
+        "WHEN 'PAYMENT' THEN 'Payment' ELSE 'Invoice' END"
+    )
+    conn.commit()
+    conn.close()
+
+    clients = sample_clients(workload)
+    sarah = Sarah(db_path)
+    results["get_financials"] = summarize(time_calls(sarah.get_financials, clients))
+
+    with day10_db(db_path) as day10:
+        results["client_report"] = summarize(time_calls(day10.client_report, clients))
+        results["search_clients"] = summarize(time_calls(day10.search_clients, clients))
+    return results
+
+
+def bench_event_log(workload, tmp, repeats):
+    events = generate_events(workload)
+    events_path = Path(tmp) / "events.jsonl"
+    checkpoint_path = Path(tmp) / "replay.checkpoint.json"
+    write_event_log(events_path, events)
+
+    replay = time_calls(
+        lambda _: replay_events(full=True, events_path=events_path, checkpoint_path=checkpoint_path),
+        range(repeats),
+    )
+
+    chain = []
+    for _ in range(repeats):
+        write_event_log(events_path, events, chained=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            chain += time_calls(
+                lambda _: chain_events(events_path, Path(tmp) / "events.backup.jsonl"), [None]
+            )
+
+    return {
+        "replay_events": summarize(replay, units_per_op=len(events)),
+        "chain_events": summarize(chain, units_per_op=len(events)),
+    }
+
+
+def bench_kb(workload, tmp):
+    kb_path = os.path.join(tmp, "kb.db")
+    create_kb(kb_path, workload)
+    backend = HashingEmbeddingBackend()
+    queries = kb_queries(workload)
+
+    search_kb(queries[0], backend=backend, db_path=kb_path)  # embeds every entry once
+    samples = time_calls(lambda q: search_kb(q, backend=backend, db_path=kb_path), queries)
+    return {"kb_search": summarize(samples)}
+
+
+def run_suite(workload, repeats=DEFAULT_REPEATS):
+    tmp = tempfile.mkdtemp()
+    cases = {}
+    try:
+        cases.update(bench_ledger(workload, tmp))
+        cases.update(bench_event_log(workload, tmp, repeats))
+        cases.update(bench_kb(workload, tmp))
+    finally:
+        close_thread_connections()
+        shutil.rmtree(tmp)
+
+    return {
+        "meta": {
+            "created": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+            "workload": workload,
+            "repeats": repeats,
+        },
+        "cases": cases,
+    }
+
+
+# -------------------------------------
+# BASELINE
+# -------------------------------------
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Cases whose p95 latency or throughput is worse than the baseline by
+    more than `tolerance`: [(case, metric, baseline value, current value)].
+    """
+    if baseline["meta"]["workload"] != results["meta"]["workload"]:
+        raise RuntimeError("Baseline was recorded with a different workload")
+
+    regressions = []
+    for name, current in results["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            continue
+        if current["p95_us"] > base["p95_us"] * (1 + tolerance):
+            regressions.append((name, "p95_us", base["p95_us"], current["p95_us"]))
+        if current["ops_per_sec"] < base["ops_per_sec"] / (1 + tolerance):
+            regressions.append((name, "ops_per_sec", base["ops_per_sec"], current["ops_per_sec"]))
+    return regressions
+
+
+def print_report(results, baseline=None):
+    print("\n--- BENCHMARK SUITE ---")
+    print(", ".join(f"{k}={v}" for k, v in results["meta"]["workload"].items()))
+    print(f"{'case':<16} {'ops':>7} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'ops/s':>10} {'vs base':>8}")
+    for name, s in results["cases"].items():
+        base = (baseline or {}).get("cases", {}).get(name)
+        delta = f"{s['p95_us'] / base['p95_us']:7.2f}x" if base else ""
+        print(f"{name:<16} {s['ops']:>7} {s['p50_us']:10.1f} {s['p95_us']:10.1f} "
+              f"{s['p99_us']:10.1f} {s['ops_per_sec']:10.0f} {delta:>8}")
+
+
+def write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic-ledger benchmark suite")
+    for key, value in DEFAULT_WORKLOAD.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    workload = make_workload(**{key: getattr(args, key) for key in DEFAULT_WORKLOAD})
+    results = run_suite(workload, args.repeats)
+
+    if args.output:
+        write_json(args.output, results)
+    if args.save_baseline:
+        write_json(args.baseline, results)
+        print_report(results)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["workload"] != workload:
+            print(f"\nBaseline {args.baseline} uses a different workload; not comparing.")
+            baseline = None
+
+    print_report(results, baseline)
+    if baseline is None:
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"\nNo regressions beyond {args.tolerance:.0%} of baseline.")
+        return 0
+
+    print(f"\nREGRESSIONS (tolerance {args.tolerance:.0%}):")
+    for name, metric, base, current in regressions:
+        print(f"- {name} {metric}: {base:.1f} -> {current:.1f}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
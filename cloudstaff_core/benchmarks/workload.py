@@ -0,0 +1,171 @@
+# cloudstaff_core/benchmarks/workload.py
+# =========================================
+# Deterministic synthetic workloads
+# =========================================
+# Everything here is a pure function of the workload dict (seed
+# included), so runs with the same parameters measure the same data.
+
+import json
+import random
+import sqlite3
+import string
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from cloudstaff_core.storage.event_chain import canonical_event_string, sha256
+
+WORKFLOW = ["onboard", "meet", "followup", "invoice"]
+
+KB_WORDS = ["invoice", "payment", "refund", "meeting", "schedule", "policy", "mpesa",
+            "bank", "transfer", "balance", "overdue", "contract", "report", "account"]
+
+LEDGER_DDL = """
+    CREATE TABLE ledger (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        client_name TEXT NOT NULL,
+        transaction_type TEXT,
+        amount REAL,
+        date TEXT,
+        notes TEXT,
+        state TEXT,
+        description TEXT,
+        type TEXT DEFAULT 'Invoice',
+        status TEXT DEFAULT 'pending'
+    )
+"""
+
+KB_DDL = """
+    CREATE TABLE kb_entries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        client TEXT,
+        question TEXT NOT NULL,
+        answer TEXT NOT NULL,
+        tags TEXT,
+        created_at TEXT NOT NULL
+    )
+"""
+
+
+DEFAULT_WORKLOAD = {
+    "clients": 1_000,
+    "events": 20_000,        # router commands; the event log holds the financial ones
+    "payment_share": 0.7,    # share of post-workflow commands that are payments
+    "kb_entries": 5_000,
+    "queries": 500,          # samples per read-path case
+    "seed": 0,
+}
+
+
+def make_workload(**overrides):
+    unknown = set(overrides) - set(DEFAULT_WORKLOAD)
+    if unknown:
+        raise ValueError(f"Unknown workload parameters: {sorted(unknown)}")
+    return {**DEFAULT_WORKLOAD, **overrides}
+
+
+def client_names(workload: dict):
+    return [f"Client{i:05d}" for i in range(workload["clients"])]
+
+
+def generate_commands(workload: dict):
+    """
+    Router commands for `events` steps. Each step picks a client: new
+    clients walk onboard -> meet -> followup -> invoice, after which the
+    step is a payment (payment_share) or another invoice. The router
+    allows one invoice per workflow, so repeat invoices exercise the
+    rejection path, as do payments once a balance is settled.
+    """
+    rng = random.Random(workload["seed"])
+    names = client_names(workload)
+    stage = dict.fromkeys(names, 0)
+    balance = dict.fromkeys(names, 0.0)
+
+    commands = []
+    for _ in range(workload["events"]):
+        name = rng.choice(names)
+        if stage[name] < len(WORKFLOW):
+            action = WORKFLOW[stage[name]]
+            stage[name] += 1
+            if action == "invoice":
+                amount = float(rng.randrange(100, 5_000))
+                balance[name] += amount
+                commands.append(f"invoice {name} {amount}")
+            else:
+                commands.append(f"{action} {name}")
+        elif rng.random() < workload["payment_share"]:
+            amount = float(rng.randrange(10, 1_000))
+            balance[name] -= min(amount, balance[name])
+            commands.append(f"payment {name} {amount}")
+        else:
+            commands.append(f"invoice {name} {float(rng.randrange(100, 5_000))}")
+    return commands
+
+
+def generate_events(workload: dict):
+    """Financial events in the replay format, one per invoice/payment command."""
+    start = datetime(2026, 1, 1)
+    events = []
+    for i, command in enumerate(generate_commands(workload)):
+        action, name, *rest = command.split()
+        if action not in ("invoice", "payment"):
+            continue
+        events.append({
+            "timestamp": (start + timedelta(seconds=i)).isoformat(),
+            "client_name": name,
+            "category": "invoice",
+            "action": "Invoice issued" if action == "invoice" else "Invoice payment",
+            "amount": float(rest[0]),
+        })
+    return events
+
+
+def write_event_log(path: Path, events, chained=True):
+    """Writes events as JSONL, hash-chained from GENESIS unless chained=False."""
+    prev_hash = "GENESIS"
+    with path.open("w", encoding="utf-8") as f:
+        for event in events:
+            if chained:
+                event = dict(event)
+                event["prev_hash"] = prev_hash
+                event["event_hash"] = prev_hash = sha256(prev_hash + canonical_event_string(event))
+            f.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+
+def create_ledger(path: str):
+    conn = sqlite3.connect(path)
+    conn.execute(LEDGER_DDL)
+    conn.commit()
+    conn.close()
+
+
+def kb_question(rng):
+    words = rng.choices(KB_WORDS, k=rng.randint(3, 7))
+    words.append("".join(rng.choices(string.ascii_lowercase, k=6)))
+    return " ".join(words) + "?"
+
+
+def create_kb(path: str, workload: dict):
+    rng = random.Random(workload["seed"])
+    names = client_names(workload)[:50] + [None]
+    now = datetime(2026, 1, 1).isoformat()
+
+    conn = sqlite3.connect(path)
+    conn.execute(KB_DDL)
+    conn.executemany(
+        "INSERT INTO kb_entries (client, question, answer, tags, created_at) VALUES (?, ?, ?, ?, ?)",
+        [(rng.choice(names), kb_question(rng), f"answer {i}", "bench", now)
+         for i in range(workload["kb_entries"])],
+    )
+    conn.commit()
+    conn.close()
+
+
+def kb_queries(workload: dict):
+    rng = random.Random(workload["seed"] + 1)
+    return [kb_question(rng) for _ in range(workload["queries"])]
+
+
+def sample_clients(workload: dict):
+    rng = random.Random(workload["seed"] + 2)
+    names = client_names(workload)
+    return [rng.choice(names) for _ in range(workload["queries"])]
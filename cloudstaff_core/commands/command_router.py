@@ -3,7 +3,22 @@
 # Command Router – Workflow & Economic Authority
 # =========================================
 
-from cloudstaff_core.agents.sarah import Sarah
+import math
+from time import perf_counter
+
+from cloudstaff_core.agents.sarah import DB_FILE, Sarah
+from cloudstaff_core.agents.state_machine import StateMachine
+from cloudstaff_core.runtime import metrics
+
+COMMANDS = metrics.counter(
+    "router_commands_total", "Commands handled by CommandRouter", ("action", "outcome")
+)
+REJECTIONS = metrics.counter(
+    "router_rejections_total", "Commands rejected by CommandRouter", ("action", "reason")
+)
+COMMAND_SECONDS = metrics.histogram(
+    "router_command_seconds", "CommandRouter command latency", ("action",)
+)
 
 
 class CommandRouter:
@@ -20,67 +35,180 @@ class CommandRouter:
         "payment_received": ["payment"],  # partials allowed
     }
 
-    def __init__(self):
-        self.sarah = Sarah()
+    # State each executed action leaves the client in
+    ACTION_STATES = {
+        "onboard": "intake_completed",
+        "meet": "meeting_scheduled",
+        "followup": "follow_up_sent",
+        "invoice": "invoice_issued",
+        "payment": "payment_received",
+    }
+
+    MACHINE = StateMachine(TRANSITION_RULES, ACTION_STATES)
+
+    # action -> handler(sarah, client, amount)
+    HANDLERS = {
+        "onboard": lambda sarah, client, amount: sarah.client_intake(client),
+        "meet": lambda sarah, client, amount: sarah.schedule_meeting(client),
+        "followup": lambda sarah, client, amount: sarah.send_follow_up(client),
+        "invoice": lambda sarah, client, amount: sarah.record_invoice(client, amount),
+        "payment": lambda sarah, client, amount: sarah.record_payment(client, amount),
+    }
+
+    # (state, action) -> handler: validates and dispatches in one lookup
+    ROUTES = MACHINE.dispatch_table(HANDLERS)
+
+    METRIC_ACTIONS = frozenset(HANDLERS) | {"report"}
+
+    def __init__(self, db_file: str = DB_FILE):
+        self.sarah = Sarah(db_file)
 
     def execute(self, command: str):
+        start = perf_counter() if metrics.ENABLED else None
+        action, reason, result = self._execute(command)
+        if start is not None:
+            self._record(action, reason, perf_counter() - start)
+        return result
+
+    def _execute(self, command: str):
+        """(action, rejection reason or None, result message)"""
         parts = command.strip().split()
         if not parts:
-            return "Empty command"
+            return None, "empty_command", "Empty command"
 
         action = parts[0].lower()
 
         # REPORT IS ALWAYS ALLOWED
         if action == "report":
             if len(parts) < 2:
-                return "Missing client name"
-            return self.sarah.report_client(parts[1])
+                return action, "missing_client", "Missing client name"
+            return action, None, self.sarah.report_client(parts[1])
 
         if len(parts) < 2:
-            return "Missing client name"
+            return action, "missing_client", "Missing client name"
 
         client = parts[1]
-        amount = float(parts[2]) if len(parts) > 2 else 0.0
+        amount = self._parse_amount(parts)
+        if amount is None:
+            return action, "invalid_amount", f"Invalid amount '{parts[2]}'."
 
         last_state = self.sarah.get_last_state(client)
-        allowed = self.TRANSITION_RULES.get(last_state, [])
+        handler, reason, rejection = self._route(
+            action, amount, last_state, lambda: self.sarah.get_financials(client)
+        )
+        if reason:
+            return action, reason, rejection
+
+        return action, None, handler(self.sarah, client, amount)
+
+    def execute_batch(self, commands):
+        """
+        Executes commands in order and returns one result per command,
+        the same results sequential execute() calls would give.
+
+        Each client's state and balance is loaded once up front and kept
+        current in memory; every accepted command is written in a single
+        transaction, which is rolled back as a whole if anything raises.
+        """
+        parsed = [command.strip().split() for command in commands]
+        clients = {parts[1] for parts in parsed if len(parts) > 1}
+        states = self.sarah.get_last_states(clients)
+        balances = self.sarah.get_balances(clients)
+
+        results = []
+        with self.sarah.batch():
+            for parts in parsed:
+                start = perf_counter() if metrics.ENABLED else None
+                action, reason, result = self._execute_loaded(parts, states, balances)
+                if start is not None:
+                    self._record(action, reason, perf_counter() - start)
+                results.append(result)
+        return results
+
+    def _execute_loaded(self, parts, states, balances):
+        if not parts:
+            return None, "empty_command", "Empty command"
+
+        action = parts[0].lower()
+        if len(parts) < 2:
+            return action, "missing_client", "Missing client name"
 
-        if action not in allowed:
-            return f"Illegal action '{action}' from state '{last_state}'."
+        client = parts[1]
+        balance = balances[client]
+
+        if action == "report":
+            return action, None, self.sarah.format_report(client, self.sarah.financials(*balance))
+
+        amount = self._parse_amount(parts)
+        if amount is None:
+            # Rejected like any other bad command, so the batch carries on
+            return action, "invalid_amount", f"Invalid amount '{parts[2]}'."
+
+        handler, reason, rejection = self._route(
+            action, amount, states[client], lambda: self.sarah.financials(*balance)
+        )
+        if reason:
+            return action, reason, rejection
+
+        result = handler(self.sarah, client, amount)
+
+        # Mirror what _persist just wrote
+        states[client] = self.MACHINE.next_state(states[client], action)
+        if action == "invoice":
+            balance[0] = (balance[0] or 0) + amount
+        elif action == "payment":
+            balance[1] = (balance[1] or 0) + amount
+        return action, None, result
+
+    @staticmethod
+    def _parse_amount(parts):
+        """The command's amount (0.0 if omitted), or None if it is not a finite number."""
+        if len(parts) < 3:
+            return 0.0
+        try:
+            amount = float(parts[2])
+        except ValueError:
+            return None
+        return amount if math.isfinite(amount) else None
+
+    def _route(self, action, amount, last_state, get_financials):
+        """
+        (handler, None, None) for a legal command, otherwise
+        (None, rejection reason, rejection message).
+        """
+        handler = self.ROUTES.get((last_state, action))
+        if handler is None:
+            return None, "illegal_transition", f"Illegal action '{action}' from state '{last_state}'."
 
         # ----------------------------------
         # ECONOMIC INVARIANTS (AUTHORITATIVE)
         # ----------------------------------
         if action == "payment":
             if amount <= 0:
-                return "Payment rejected: amount must be positive."
+                return None, "non_positive_amount", "Payment rejected: amount must be positive."
 
-            financials = self.sarah.get_financials(client)
+            financials = get_financials()
 
             if financials["invoiced"] <= 0:
-                return "Payment rejected: no invoice issued."
+                return None, "no_invoice", "Payment rejected: no invoice issued."
 
             if financials["balance"] <= 0:
-                return "Payment rejected: balance already settled."
+                return None, "balance_settled", "Payment rejected: balance already settled."
 
             if amount > financials["balance"]:
-                return (
+                return None, "exceeds_balance", (
                     f"Payment rejected: amount exceeds balance "
                     f"({financials['balance']})."
                 )
 
-        # ----------------------------------
-        # EXECUTION
-        # ----------------------------------
-        if action == "onboard":
-            return self.sarah.client_intake(client)
-        if action == "meet":
-            return self.sarah.schedule_meeting(client)
-        if action == "followup":
-            return self.sarah.send_follow_up(client)
-        if action == "invoice":
-            return self.sarah.record_invoice(client, amount)
-        if action == "payment":
-            return self.sarah.record_payment(client, amount)
-
-        return f"Unknown action '{action}'."
+        return handler, None, None
+
+    def _record(self, action, reason, seconds):
+        # Free-text actions would make unbounded label sets
+        action = action if action in self.METRIC_ACTIONS else "unknown"
+        COMMAND_SECONDS.observe(seconds, action)
+        if reason:
+            COMMANDS.inc(action, "rejected")
+            REJECTIONS.inc(action, reason)
+        else:
+            COMMANDS.inc(action, "accepted")
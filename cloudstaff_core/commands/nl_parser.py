@@ -1,4 +1,38 @@
 import re
+from time import perf_counter
+
+from cloudstaff_core.runtime import metrics
+
+# Intents in priority order: the highest-priority intent present in
+# the text wins, wherever it appears. "meet" needs "schedule"/"set"
+# followed later on the same line by "meeting"/"call".
+INTENT_PRIORITY = ["onboard", "meet", "followup", "invoice", "payment", "report"]
+
+# One alternation over the lowercased text; every keyword is a token
+# and no keyword can start inside another one's match, so a single
+# finditer sees each of them.
+INTENT_TOKENS = re.compile(
+    r"\b(?:"
+    r"(?P<onboard>onboard|add|register)"
+    r"|(?P<meet_verb>schedule|set)"
+    r"|(?P<meet_noun>meeting|call)"
+    r"|(?P<followup>follow up|follow-up|check in)"
+    r")\b"
+    r"|(?P<invoice>invoice)"
+    r"|(?P<payment>payment|paid)"
+    r"|(?P<report>report|summary)"
+)
+
+# Client name markers in priority order
+NAME_MARKERS = ["client", "for", "with", "to", "named"]
+NAME_TOKENS = re.compile(rf"\b({'|'.join(NAME_MARKERS)})\s+([A-Z][a-z]+)")
+_MARKER_RANK = {marker: rank for rank, marker in enumerate(NAME_MARKERS)}
+
+AMOUNT = re.compile(r"\b\d+(\.\d+)?\b")
+
+PARSES = metrics.counter("nl_parse_total", "Utterances parsed, by intent", ("intent",))
+PARSE_SECONDS = metrics.histogram("nl_parse_seconds", "NaturalLanguageParser.parse latency")
+
 
 class NaturalLanguageParser:
     """
@@ -9,45 +43,64 @@ class NaturalLanguageParser:
     """
 
     def parse(self, text: str) -> str:
+        if not metrics.ENABLED:
+            return self._parse(text)[1]
+
+        start = perf_counter()
+        intent, command = self._parse(text)
+        PARSE_SECONDS.observe(perf_counter() - start)
+        PARSES.inc(intent or "none")
+        return command
+
+    def _parse(self, text: str):
+        """(intent or None, command string)"""
         if not text or not isinstance(text, str):
-            return ""
+            return None, ""
 
         t = text.strip()
-        tl = t.lower()
+        intent = self._classify(t.lower())
+        if intent is None:
+            return None, ""
 
         name = self._extract_client_name(t)
 
-        # Onboarding
-        if re.search(r"\b(onboard|add|register)\b", tl):
-            return f"onboard {name}"
-
-        # Meeting
-        if re.search(r"\b(schedule|set)\b.*\b(meeting|call)\b", tl):
-            return f"meet {name}"
-
-        # Follow-up
-        if re.search(r"\b(follow up|follow-up|check in)\b", tl):
-            return f"followup {name}"
-
-        # Invoice (amount REQUIRED)
-        if "invoice" in tl:
-            amount = self._extract_amount(t)
-            if amount is None:
-                return "error missing_amount invoice"
-            return f"invoice {name} {amount}"
-
-        # Payment (amount REQUIRED)
-        if "payment" in tl or "paid" in tl:
+        # Invoice / payment (amount REQUIRED)
+        if intent == "invoice" or intent == "payment":
             amount = self._extract_amount(t)
             if amount is None:
-                return "error missing_amount payment"
-            return f"payment {name} {amount}"
-
-        # Report
-        if "report" in tl or "summary" in tl:
-            return f"report {name}"
-
-        return ""
+                return intent, f"error missing_amount {intent}"
+            return intent, f"{intent} {name} {amount}"
+
+        return intent, f"{intent} {name}"
+
+    def parse_many(self, texts) -> list:
+        """Parses a batch of utterances; same results as parse() on each."""
+        if not metrics.ENABLED:
+            parse = self._parse
+            return [parse(text)[1] for text in texts]
+        parse = self.parse
+        return [parse(text) for text in texts]
+
+    def _classify(self, tl: str):
+        found = set()
+        verb_end = None
+
+        for match in INTENT_TOKENS.finditer(tl):
+            intent = match.lastgroup
+            if intent == "onboard":
+                return intent  # top priority, nothing can beat it
+            if intent == "meet_verb":
+                verb_end = match.end()
+            elif intent == "meet_noun":
+                if verb_end is not None and "\n" not in tl[verb_end:match.start()]:
+                    found.add("meet")
+            else:
+                found.add(intent)
+
+        for intent in INTENT_PRIORITY:
+            if intent in found:
+                return intent
+        return None
 
     def _extract_client_name(self, text: str) -> str:
         """
@@ -57,32 +110,28 @@ class NaturalLanguageParser:
         2. 'for X'
         3. 'with X'
         4. 'to X'
-        5. Last Title-cased word fallback
+        5. 'named X'
+        6. Last Title-cased word fallback
         """
-
-        patterns = [
-            r"\bclient\s+([A-Z][a-z]+)",
-            r"\bfor\s+([A-Z][a-z]+)",
-            r"\bwith\s+([A-Z][a-z]+)",
-            r"\bto\s+([A-Z][a-z]+)",
-            r"\bnamed\s+([A-Z][a-z]+)"
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group(1)
+        best, best_rank = None, len(NAME_MARKERS)
+        for match in NAME_TOKENS.finditer(text):
+            rank = _MARKER_RANK[match.group(1)]
+            if rank < best_rank:
+                best, best_rank = match.group(2), rank
+                if rank == 0:
+                    break
+        if best is not None:
+            return best
 
         # Fallback: last capitalized word
-        words = text.split()
-        for w in reversed(words):
+        for w in reversed(text.split()):
             if w.istitle():
                 return w
 
         return "Unknown"
 
     def _extract_amount(self, text: str):
-        match = re.search(r"\b\d+(\.\d+)?\b", text)
+        match = AMOUNT.search(text)
         if not match:
             return None
         return float(match.group())
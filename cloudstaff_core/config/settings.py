@@ -1,8 +1,67 @@
-from dotenv import load_dotenv
 import os
-load_dotenv() # reads .env at project root
+from functools import lru_cache
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise RuntimeError("OPENAI_API_KEY not set")
+_dotenv_loaded = False
 
+
+def _load_dotenv():
+    # Deferred so importing this module costs nothing; reads .env at project root
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        _dotenv_loaded = True
+        try:
+            from dotenv import load_dotenv
+        except ImportError:
+            return  # without python-dotenv there is no .env to read
+        load_dotenv()
+
+
+class Settings:
+    """
+    Lazily evaluated configuration.
+
+    Nothing is read at import time: .env is parsed on the first value
+    access, each value is cached once read, and a required value only
+    raises when it is actually used.
+    """
+
+    def __init__(self):
+        self._values = {}
+
+    def _get(self, name, default=None, required=False):
+        if name not in self._values:
+            # The environment wins over .env, so only parse .env when needed
+            if name not in os.environ:
+                _load_dotenv()
+            self._values[name] = os.getenv(name, default)
+
+        value = self._values[name]
+        if required and not value:
+            raise RuntimeError(f"{name} not set")
+        return value
+
+    @property
+    def OPENAI_API_KEY(self):
+        return self._get("OPENAI_API_KEY", required=True)
+
+    @property
+    def KB_EMBEDDING_BACKEND(self):
+        return self._get("KB_EMBEDDING_BACKEND", default="openai")
+
+    @property
+    def SNAPSHOT_HMAC_KEY(self):
+        # Optional; without it snapshot digests are unkeyed (see day11_persistence)
+        return self._get("SNAPSHOT_HMAC_KEY")
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    return Settings()
+
+
+def __getattr__(name):
+    # Keeps `from cloudstaff_core.config.settings import OPENAI_API_KEY` working,
+    # validating at that point rather than when the module is first imported
+    if name.isupper() and isinstance(getattr(Settings, name, None), property):
+        return getattr(get_settings(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,189 @@
+import json
+
+import numpy as np
+
+from cloudstaff_core.experiments.kb_embeddings import load_matrix, normalize
+
+
+class _Bucket:
+    """Vectors of one (inverted list, client) pair in a growable array."""
+
+    def __init__(self, dim):
+        self.ids = np.empty(16, dtype=np.int64)
+        self.vectors = np.empty((16, dim), dtype=np.float32)
+        self.size = 0
+        self.positions = {}
+
+    def add(self, row_id, vector):
+        if self.size == len(self.ids):
+            self.ids = np.resize(self.ids, 2 * self.size)
+            self.vectors = np.resize(self.vectors, (2 * self.size, self.vectors.shape[1]))
+        self.ids[self.size] = row_id
+        self.vectors[self.size] = vector
+        self.positions[row_id] = self.size
+        self.size += 1
+
+    def remove(self, row_id):
+        pos = self.positions.pop(row_id)
+        last = self.size - 1
+        if pos != last:
+            moved = int(self.ids[last])
+            self.ids[pos] = moved
+            self.vectors[pos] = self.vectors[last]
+            self.positions[moved] = pos
+        self.size = last
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index over L2-normalized vectors (cosine = dot).
+
+    Vectors are assigned to the nearest of n_lists k-means centroids and
+    a query scans only the n_probe closest lists. Each list is further
+    split per client, so a client-filtered search touches that client's
+    vectors only and keeps probing further lists until it has k
+    candidates, instead of post-filtering a global result.
+    """
+
+    def __init__(self, dim, n_lists=64, n_probe=8, seed=0):
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.seed = seed
+        self.centroids = None
+        self.buckets = {}       # (list_no, client) -> _Bucket
+        self.list_clients = {}  # list_no -> clients with a bucket in that list
+        self.location = {}      # id -> (list_no, client)
+
+    def __len__(self):
+        return len(self.location)
+
+    # -----------------------
+    # Training
+    # -----------------------
+    def train(self, vectors, iterations=10, sample_size=50000):
+        """Spherical k-means on (a sample of) the vectors."""
+        vectors = normalize(vectors)
+        rng = np.random.default_rng(self.seed)
+        if len(vectors) > sample_size:
+            vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+
+        n_lists = min(self.n_lists, len(vectors))
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            assign = np.argmax(vectors @ centroids.T, axis=1)
+            for j in range(n_lists):
+                members = vectors[assign == j]
+                if len(members):
+                    centroids[j] = members.sum(axis=0)
+            centroids = normalize(centroids)
+
+        self.centroids = centroids
+        self.n_lists = n_lists
+        return self
+
+    # -----------------------
+    # Updates
+    # -----------------------
+    def add(self, ids, vectors, clients=None):
+        if self.centroids is None:
+            raise RuntimeError("Index must be trained before adding vectors")
+
+        vectors = normalize(np.atleast_2d(vectors))
+        clients = clients if clients is not None else [None] * len(vectors)
+        assign = np.argmax(vectors @ self.centroids.T, axis=1)
+
+        for row_id, vector, client, list_no in zip(ids, vectors, clients, assign):
+            row_id = int(row_id)
+            if row_id in self.location:
+                self.remove([row_id])
+            key = (int(list_no), client)
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = _Bucket(self.dim)
+                self.list_clients.setdefault(key[0], []).append(client)
+            bucket.add(row_id, vector)
+            self.location[row_id] = key
+
+    def remove(self, ids):
+        for row_id in ids:
+            key = self.location.pop(int(row_id), None)
+            if key is not None:
+                self.buckets[key].remove(int(row_id))
+
+    # -----------------------
+    # Search
+    # -----------------------
+    def search(self, query, k=3, client=None, n_probe=None):
+        """Returns (ids, scores), best first."""
+        if self.centroids is None:
+            raise RuntimeError("Index must be trained before searching")
+        query = normalize(query)
+        order = np.argsort(-(self.centroids @ query))
+        n_probe = n_probe or self.n_probe
+
+        ids, scores, found = [], [], 0
+        for probed, list_no in enumerate(order):
+            if probed >= n_probe and found >= k:
+                break
+            list_no = int(list_no)
+            keys = [(list_no, client)] if client is not None else [
+                (list_no, c) for c in self.list_clients.get(list_no, [])
+            ]
+            for key in keys:
+                bucket = self.buckets.get(key)
+                if bucket is None or bucket.size == 0:
+                    continue
+                ids.append(bucket.ids[:bucket.size])
+                scores.append(bucket.vectors[:bucket.size] @ query)
+                found += bucket.size
+
+        if not ids:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        ids, scores = np.concatenate(ids), np.concatenate(scores)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return ids[top], scores[top]
+
+    # -----------------------
+    # Persistence
+    # -----------------------
+    def save(self, path):
+        ids, vectors, clients = [], [], []
+        for (list_no, client), bucket in self.buckets.items():
+            ids.append(bucket.ids[:bucket.size])
+            vectors.append(bucket.vectors[:bucket.size])
+            clients.extend([client] * bucket.size)
+
+        np.savez(
+            path,
+            centroids=self.centroids,
+            ids=np.concatenate(ids) if ids else np.zeros(0, dtype=np.int64),
+            vectors=np.concatenate(vectors) if vectors else np.zeros((0, self.dim), np.float32),
+            clients=np.array(json.dumps(clients)),
+            params=np.array([self.dim, self.n_lists, self.n_probe, self.seed]),
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        dim, n_lists, n_probe, seed = (int(v) for v in data["params"])
+        index = cls(dim, n_lists, n_probe, seed)
+        index.centroids = data["centroids"]
+        index.add(data["ids"], data["vectors"], json.loads(str(data["clients"])))
+        return index
+
+    @classmethod
+    def build_from_db(cls, conn, backend, n_lists=None, n_probe=8):
+        """Trains and fills an index from the cached kb_entries vectors."""
+        ids, _, clients, matrix = load_matrix(conn, backend)
+        if not ids:
+            raise RuntimeError("No embedded KB entries to index")
+
+        n_lists = n_lists or max(1, int(np.sqrt(len(ids))))
+        index = cls(matrix.shape[1], n_lists, n_probe).train(matrix)
+        index.add(ids, matrix, clients)
+        return index
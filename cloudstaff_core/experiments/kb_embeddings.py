@@ -0,0 +1,162 @@
+import hashlib
+import importlib.util
+import re
+
+import numpy as np
+
+from cloudstaff_core.config.settings import get_settings
+
+
+# -----------------------
+# Embedding backends
+# -----------------------
+class OpenAIEmbeddingBackend:
+    def __init__(self, model="text-embedding-3-small", api_key=None):
+        self.model = model
+        self.name = f"openai:{model}"
+        self._api_key = api_key
+        self._client = None
+
+    def embed(self, texts):
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self._api_key or get_settings().OPENAI_API_KEY)
+        response = self._client.embeddings.create(model=self.model, input=list(texts))
+        return np.array([d.embedding for d in response.data], dtype=np.float32)
+
+
+class HashingEmbeddingBackend:
+    """
+    Offline, deterministic stand-in: signed feature hashing of word
+    unigrams and bigrams. Good enough to rank near-duplicate questions
+    and to benchmark the search path without the API.
+    """
+
+    def __init__(self, dim=256):
+        self.dim = dim
+        self.name = f"local:hashing-{dim}"
+
+    def _vector(self, text):
+        vec = np.zeros(self.dim, dtype=np.float32)
+        words = re.findall(r"\w+", text.lower())
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+            vec[h % self.dim] += 1.0 if (h >> 63) else -1.0
+        return vec
+
+    def embed(self, texts):
+        return np.stack([self._vector(t) for t in texts]) if texts else np.zeros((0, self.dim), np.float32)
+
+
+def get_backend(name=None):
+    # KB_EMBEDDING_BACKEND=local runs without network or API key
+    name = name or get_settings().KB_EMBEDDING_BACKEND
+    if name == "local":
+        return HashingEmbeddingBackend()
+    if name == "openai":
+        return OpenAIEmbeddingBackend()
+    raise ValueError(f"Unknown embedding backend: {name}")
+
+
+def backend_unavailable(name=None):
+    """
+    Why get_backend(name) could not embed right now, or None if it can.
+    Lets callers skip embedding up front instead of failing mid-run.
+    """
+    name = name or get_settings().KB_EMBEDDING_BACKEND
+    if name == "local":
+        return None
+    if name == "openai":
+        try:
+            get_settings().OPENAI_API_KEY
+        except RuntimeError:
+            return "OPENAI_API_KEY not set"
+        if importlib.util.find_spec("openai") is None:
+            return "openai package not installed"
+        return None
+    return f"unknown embedding backend: {name}"
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+# -----------------------
+# Embedding cache in kb_entries
+# -----------------------
+def ensure_schema(conn):
+    """
+    Adds the cached-vector columns and a trigger that drops a cached
+    vector whenever its question text changes.
+    """
+    c = conn.cursor()
+    columns = {row[1] for row in c.execute("PRAGMA table_info(kb_entries)")}
+    if "embedding" not in columns:
+        c.execute("ALTER TABLE kb_entries ADD COLUMN embedding BLOB")
+    if "embedding_model" not in columns:
+        c.execute("ALTER TABLE kb_entries ADD COLUMN embedding_model TEXT")
+    c.execute("""
+        CREATE TRIGGER IF NOT EXISTS kb_entries_question_changed
+        AFTER UPDATE OF question ON kb_entries
+        WHEN OLD.question IS NOT NEW.question
+        BEGIN
+            UPDATE kb_entries SET embedding = NULL WHERE id = NEW.id;
+        END
+    """)
+    conn.commit()
+
+
+def refresh_embeddings(conn, backend, batch_size=256):
+    """
+    Embeds only rows without a vector from this backend: new entries,
+    edited questions and rows embedded by a different model.
+    Vectors are stored L2-normalized as float32 bytes.
+    """
+    c = conn.cursor()
+    c.execute(
+        "SELECT id, question FROM kb_entries WHERE embedding IS NULL OR embedding_model IS NOT ?",
+        (backend.name,),
+    )
+    pending = c.fetchall()
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        vectors = normalize(backend.embed([q for _, q in batch]))
+        c.executemany(
+            "UPDATE kb_entries SET embedding = ?, embedding_model = ? WHERE id = ?",
+            [(vec.tobytes(), backend.name, row_id) for (row_id, _), vec in zip(batch, vectors)],
+        )
+    conn.commit()
+    return len(pending)
+
+
+def load_matrix(conn, backend, client_filter=None):
+    """Returns (ids, answers, clients, matrix) for rows embedded by `backend`."""
+    c = conn.cursor()
+    sql = "SELECT id, answer, client, embedding FROM kb_entries WHERE embedding_model = ?"
+    params = (backend.name,)
+    if client_filter:
+        sql += " AND client = ?"
+        params += (client_filter,)
+    c.execute(sql, params)
+    rows = c.fetchall()
+
+    if not rows:
+        return [], [], [], np.zeros((0, 0), dtype=np.float32)
+
+    matrix = np.frombuffer(b"".join(r[3] for r in rows), dtype=np.float32).reshape(len(rows), -1)
+    return [r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows], matrix
+
+
+def top_k(matrix, query_vec, k):
+    """Indices of the k best cosine scores (rows and query pre-normalized), best first."""
+    if len(matrix) == 0 or k <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+    scores = matrix @ query_vec
+    k = min(k, len(scores))
+    idx = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return idx, scores[idx]
@@ -0,0 +1,185 @@
+# ==============================
+# Ledger Query Plan Regression Check
+# ==============================
+# Builds a throwaway ledger with the production schema, applies the
+# index migration and asserts that every hot query is answered by a
+# SEARCH through the index it was designed for. Exits non-zero on any
+# full scan of a ledger table (table or index) or an unexpected index.
+
+import re
+import sqlite3
+import sys
+
+from cloudstaff_core.storage.ledger_schema import migrate_fts, migrate_indexes
+
+# name -> (sql, params, index the lookup must SEARCH through)
+HOT_QUERIES = {
+    "Sarah.get_last_state": (
+        "SELECT state FROM ledger WHERE client_name = ? ORDER BY id DESC LIMIT 1",
+        ("Noah",),
+        "idx_ledger_client_id",
+    ),
+    "Sarah.get_financials": (
+        "SELECT invoiced, paid FROM client_balances WHERE client_name = ?",
+        ("Noah",),
+        "sqlite_autoindex_client_balances_1",
+    ),
+    "client_reports (bulk, by client)": (
+        """
+        SELECT client_name,
+               SUM(CASE WHEN type='Invoice' THEN amount END),
+               SUM(CASE WHEN type='Payment' THEN amount END),
+               AVG(CASE WHEN type='Invoice' THEN amount END),
+               COUNT(CASE WHEN type='Invoice' THEN 1 END)
+        FROM ledger
+        WHERE client_name IN (SELECT value FROM json_each(?))
+        GROUP BY client_name
+        ORDER BY client_name
+        """,
+        ('["Client1", "Client2"]',),
+        "idx_ledger_client_id",
+    ),
+    "client_report invoiced": (
+        "SELECT SUM(amount) FROM ledger WHERE client_name=? AND type='Invoice'",
+        ("Noah",),
+        "idx_ledger_type_client_amount",
+    ),
+    "client_report paid": (
+        "SELECT SUM(amount) FROM ledger WHERE client_name=? AND type='Payment'",
+        ("Noah",),
+        "idx_ledger_type_client_amount",
+    ),
+    "client_report invoice_count": (
+        "SELECT COUNT(*) FROM ledger WHERE client_name=? AND type='Invoice'",
+        ("Noah",),
+        "idx_ledger_type_client_amount",
+    ),
+    "overdue_clients": (
+        """
+        SELECT client_name, SUM(amount) FROM ledger
+        WHERE type='Invoice' AND state='pending' AND date <= ?
+        GROUP BY client_name
+        """,
+        ("2026-01-01",),
+        "idx_ledger_type_state_client",
+    ),
+    "overdue_clients (day3)": (
+        """
+        SELECT client_name, SUM(amount)
+        FROM ledger
+        WHERE type='Invoice'
+          AND state='pending'
+          AND amount > 0
+          AND date <= ?
+        GROUP BY client_name
+        """,
+        ("2026-01-01",),
+        "idx_ledger_type_state_client",
+    ),
+    "high_value_clients": (
+        """
+        SELECT client_name, SUM(amount) FROM ledger
+        WHERE type='Invoice'
+        GROUP BY client_name
+        HAVING SUM(amount) >= ?
+        """,
+        (1000,),
+        "idx_ledger_type_client_amount",
+    ),
+    "search_clients (full-text)": (
+        """
+        SELECT ledger.client_name, ledger.description, ledger.type, ledger.amount
+        FROM (
+            SELECT rowid AS hit_id, bm25(ledger_fts) AS hit_rank
+            FROM ledger_fts WHERE ledger_fts MATCH ?
+        ) AS hits
+        JOIN ledger ON ledger.id = hits.hit_id
+        ORDER BY hits.hit_rank
+        """,
+        ('"Client1"*',),
+        "INTEGER PRIMARY KEY",
+    ),
+}
+
+
+def build_ledger():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""
+        CREATE TABLE ledger (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            client_name TEXT NOT NULL,
+            transaction_type TEXT,
+            amount REAL,
+            date TEXT,
+            notes TEXT,
+            state TEXT,
+            description TEXT,
+            type TEXT DEFAULT 'Invoice',
+            status TEXT DEFAULT 'pending'
+        )
+    """)
+    rows = [
+        (f"Client{i % 200}", "Invoice" if i % 3 else "Payment", float(i % 900),
+         f"2025-{i % 12 + 1:02d}-01", "pending" if i % 2 else "complete")
+        for i in range(5000)
+    ]
+    conn.executemany(
+        "INSERT INTO ledger (client_name, type, amount, date, state) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    # Sarah._ensure_balances
+    conn.execute("""
+        CREATE TABLE client_balances (
+            client_name TEXT PRIMARY KEY,
+            invoiced REAL,
+            paid REAL
+        )
+    """)
+    conn.execute(
+        "INSERT INTO client_balances SELECT client_name, SUM(amount), NULL FROM ledger GROUP BY client_name"
+    )
+    migrate_indexes(conn)
+    migrate_fts(conn)
+    return conn
+
+
+# "SCAN ledger USING INDEX ..." walks the whole index, so it is as much
+# a full scan as a bare "SCAN ledger". ledger_fts and json_each scans are
+# virtual-table lookups.
+LEDGER_SCAN = re.compile(r"^SCAN (ledger|client_balances)\b")
+
+
+def plan_problems(conn, sql, params, expected):
+    """(plan lines, problems) for one query."""
+    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    problems = [f"full scan: {d}" for d in plan if LEDGER_SCAN.match(d)]
+
+    search = re.compile(rf"^SEARCH \w+ USING (COVERING )?(INDEX )?{re.escape(expected)}\b")
+    if not any(search.match(d) for d in plan):
+        problems.append(f"expected SEARCH via {expected}")
+    return plan, problems
+
+
+def run_checks():
+    conn = build_ledger()
+    report = []
+    failures = 0
+
+    for name, (sql, params, expected) in HOT_QUERIES.items():
+        plan, problems = plan_problems(conn, sql, params, expected)
+        if problems:
+            failures += 1
+            report.append(f"{name}: FAIL [{'; '.join(problems)}] ({'; '.join(plan)})")
+        else:
+            report.append(f"{name}: PASS ({'; '.join(plan)})")
+
+    conn.close()
+    return report, failures
+
+
+if __name__ == "__main__":
+    report, failures = run_checks()
+    print("\n--- LEDGER QUERY PLAN CHECK ---")
+    for line in report:
+        print(line)
+    sys.exit(1 if failures else 0)
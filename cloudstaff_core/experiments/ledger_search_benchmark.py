@@ -0,0 +1,133 @@
+# ==============================
+# Ledger Search Benchmark
+# ==============================
+# Grows a throwaway ledger through several sizes and times the old
+# LIKE '%keyword%' search against the FTS5 search_ledger at each one.
+# LIKE cost grows with the table; FTS cost follows the match count.
+#
+#   python -m cloudstaff_core.experiments.ledger_search_benchmark [max_rows]
+#
+# max_rows defaults to 1M; pass 3000000 for the largest step.
+
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from cloudstaff_core.storage.connection_pool import close_thread_connections, get_connection
+from cloudstaff_core.storage.ledger_schema import migrate_fts, migrate_indexes
+from cloudstaff_core.storage.ledger_search import search_ledger
+
+SIZES = [10_000, 100_000, 1_000_000, 3_000_000]
+DEFAULT_MAX_ROWS = 1_000_000
+RUNS = 5
+
+WORDS = ["invoice", "payment", "bulk", "random", "stress", "onboarded", "meeting",
+         "scheduled", "follow", "email", "sent", "received", "issued", "transaction"]
+RARE_CLIENT = "Quentin"  # 10 more rows per size step
+
+QUERIES = {
+    "rare client": (RARE_CLIENT, None),
+    "prefix": ("Quen", None),
+    "phrase + type": ('"late fee"', ["Invoice"]),
+}
+
+
+def create_ledger(path):
+    # Pooled, like the dayN helpers, so searches skip the FTS check
+    conn = get_connection(path)
+    conn.execute("""
+        CREATE TABLE ledger (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            client_name TEXT NOT NULL,
+            transaction_type TEXT,
+            amount REAL,
+            date TEXT,
+            notes TEXT,
+            state TEXT,
+            description TEXT,
+            type TEXT DEFAULT 'Invoice',
+            status TEXT DEFAULT 'pending'
+        )
+    """)
+    migrate_indexes(conn)
+    migrate_fts(conn)  # triggers index every row inserted below
+    return conn
+
+
+def grow(conn, rows, rng):
+    batch = []
+    for i in range(rows):
+        batch.append((
+            f"Client{rng.randrange(5000)}",
+            rng.choice(["Invoice", "Payment"]),
+            float(rng.randrange(1000)),
+            f"2025-{rng.randrange(12) + 1:02d}-01",
+            " ".join(rng.choice(WORDS) for _ in range(3)),
+            " ".join(rng.choice(WORDS) for _ in range(2)),
+        ))
+        if len(batch) == 50_000 or i == rows - 1:
+            conn.executemany(
+                "INSERT INTO ledger (client_name, type, amount, date, description, notes) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+            conn.commit()
+            batch = []
+
+
+def add_needles(conn):
+    conn.executemany(
+        "INSERT INTO ledger (client_name, type, amount, date, description, notes) "
+        "VALUES (?, 'Invoice', 10, '2025-01-01', ?, '')",
+        [(RARE_CLIENT, "late fee invoice" if i % 2 else "Invoice issued") for i in range(10)],
+    )
+    conn.commit()
+
+
+def timed(fn):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, len(result)
+
+
+def like_search(conn, keyword, types):
+    sql = "SELECT client_name, description, type, amount FROM ledger WHERE (client_name LIKE ? OR description LIKE ?)"
+    params = [f"%{keyword}%", f"%{keyword}%"]
+    if types:
+        sql += f" AND type IN ({','.join('?' * len(types))})"
+        params += types
+    return conn.execute(sql, params).fetchall()
+
+
+def run(max_rows=DEFAULT_MAX_ROWS):
+    tmp = tempfile.mkdtemp()
+    rng = random.Random(0)
+    conn = create_ledger(os.path.join(tmp, "ledger.db"))
+
+    print("\n--- LEDGER SEARCH BENCHMARK ---")
+    print(f"{'rows':>10}  {'query':<14} {'LIKE ms':>9} {'FTS ms':>8} {'hits':>6}")
+    try:
+        total = 0
+        for size in [s for s in SIZES if s <= max_rows]:
+            grow(conn, size - total, rng)
+            total = size
+            add_needles(conn)
+
+            for label, (keyword, types) in QUERIES.items():
+                like_ms, _ = timed(lambda: like_search(conn, keyword.strip('"'), types))
+                fts_ms, hits = timed(lambda: search_ledger(conn, keyword, types=types))
+                print(f"{size:>10}  {label:<14} {like_ms:9.2f} {fts_ms:8.2f} {hits:>6}")
+    finally:
+        close_thread_connections()
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MAX_ROWS)
@@ -0,0 +1,80 @@
+# ==============================
+# LLM Gateway Benchmark
+# ==============================
+# Simulates many concurrent chat sessions against the fake backend and
+# compares the gateway (bounded concurrency, coalescing, response cache)
+# with one uncached call per message. Runs offline.
+
+import asyncio
+import random
+import statistics
+import time
+
+from cloudstaff_core.runtime.llm_gateway import FakeBackend, LLMGateway
+
+SESSIONS = 200
+MESSAGES_PER_SESSION = 10
+DISTINCT_MESSAGES = 150  # common questions repeat across sessions
+LATENCY = 0.02
+MAX_CONCURRENCY = 32
+SYSTEM_PROMPT = "You are Sarah, a finance assistant. " * 20
+
+
+def workload(seed=0):
+    rng = random.Random(seed)
+    return [
+        [f"question {rng.randrange(DISTINCT_MESSAGES)}" for _ in range(MESSAGES_PER_SESSION)]
+        for _ in range(SESSIONS)
+    ]
+
+
+async def session(complete, messages, latencies):
+    for message in messages:
+        start = time.perf_counter()
+        await complete(SYSTEM_PROMPT, message)
+        latencies.append(time.perf_counter() - start)
+
+
+async def drive(complete, sessions):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(session(complete, messages, latencies) for messages in sessions))
+    return time.perf_counter() - start, latencies
+
+
+def report(label, elapsed, latencies, calls):
+    latencies = sorted(latencies)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(
+        f"{label:<24} {len(latencies) / elapsed:9.0f} msg/s  "
+        f"p50 {statistics.median(latencies) * 1000:6.1f} ms  "
+        f"p95 {p95 * 1000:6.1f} ms  backend calls {calls}"
+    )
+
+
+async def run():
+    sessions = workload()
+    print("\n--- LLM GATEWAY BENCHMARK ---")
+    print(f"{SESSIONS} sessions x {MESSAGES_PER_SESSION} messages, "
+          f"{DISTINCT_MESSAGES} distinct, backend latency {LATENCY * 1000:.0f} ms\n")
+
+    # Baseline: same concurrency limit, every message goes to the backend
+    direct = FakeBackend(LATENCY)
+    limit = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def uncached(system_prompt, message):
+        async with limit:
+            return await direct.complete(system_prompt, message)
+
+    elapsed, latencies = await drive(uncached, sessions)
+    report("uncached", elapsed, latencies, direct.calls)
+
+    backend = FakeBackend(LATENCY)
+    gateway = LLMGateway(backend, max_concurrency=MAX_CONCURRENCY)
+    elapsed, latencies = await drive(gateway.complete, sessions)
+    report("gateway", elapsed, latencies, backend.calls)
+    print(f"\ngateway stats: {gateway.stats}, cached entries {len(gateway.cache)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,134 @@
+# ==============================
+# NL Parser Benchmark
+# ==============================
+# Checks that the compiled, table-driven NaturalLanguageParser returns
+# exactly what the original rule-by-rule parser did over a large
+# generated corpus, then compares their throughput.
+
+import random
+import re
+import time
+
+from cloudstaff_core.commands.nl_parser import NaturalLanguageParser
+
+CORPUS_SIZE = 100_000
+
+TEMPLATES = [
+    "Please onboard client {name}",
+    "Add {name} as a new client",
+    "register {name}",
+    "Schedule a meeting with {name}",
+    "set up a call for {name} tomorrow",
+    "Send a follow up to {name}",
+    "check in with {name} next week",
+    "Invoice {name} {amount}",
+    "Send an invoice to {name} for {amount} dollars",
+    "invoice client {name}",
+    "{name} paid {amount}",
+    "Record a payment from {name} of {amount}",
+    "Give me a report for {name}",
+    "summary named {name}",
+    "What is the weather like",
+    "schedule\na CALL named {name}",
+    "FOLLOW-UP {name} about invoice {amount}",
+    "{name} said hello",
+    "",
+]
+NAMES = ["Noah", "Olivia", "Liam", "Emma", "Ava", "noah", "ACME", "Zoë"]
+
+# Fragments glued together at random to probe rule interactions:
+# keywords touching each other, across lines, inside other words
+FRAGMENTS = [
+    "onboard", "add", "register", "schedule", "set", "meeting", "call", "follow up",
+    "follow-up", "check in", "invoice", "payment", "paid", "report", "summary",
+    "client", "for", "with", "to", "named", "Noah", "Olivia", "12", "3.5", "re", "un",
+    "ting", "s", " ", " ", " ", "\n", "-", ".",
+]
+
+
+# -------------------------------------
+# Reference: the original multi-search parser
+# -------------------------------------
+class LegacyParser:
+    def parse(self, text):
+        if not text or not isinstance(text, str):
+            return ""
+        t = text.strip()
+        tl = t.lower()
+        name = self._extract_client_name(t)
+        if re.search(r"\b(onboard|add|register)\b", tl):
+            return f"onboard {name}"
+        if re.search(r"\b(schedule|set)\b.*\b(meeting|call)\b", tl):
+            return f"meet {name}"
+        if re.search(r"\b(follow up|follow-up|check in)\b", tl):
+            return f"followup {name}"
+        if "invoice" in tl:
+            amount = self._extract_amount(t)
+            return "error missing_amount invoice" if amount is None else f"invoice {name} {amount}"
+        if "payment" in tl or "paid" in tl:
+            amount = self._extract_amount(t)
+            return "error missing_amount payment" if amount is None else f"payment {name} {amount}"
+        if "report" in tl or "summary" in tl:
+            return f"report {name}"
+        return ""
+
+    def _extract_client_name(self, text):
+        for pattern in [r"\bclient\s+([A-Z][a-z]+)", r"\bfor\s+([A-Z][a-z]+)",
+                        r"\bwith\s+([A-Z][a-z]+)", r"\bto\s+([A-Z][a-z]+)",
+                        r"\bnamed\s+([A-Z][a-z]+)"]:
+            match = re.search(pattern, text)
+            if match:
+                return match.group(1)
+        for w in reversed(text.split()):
+            if w.istitle():
+                return w
+        return "Unknown"
+
+    def _extract_amount(self, text):
+        match = re.search(r"\b\d+(\.\d+)?\b", text)
+        return None if not match else float(match.group())
+
+
+def corpus(size=CORPUS_SIZE, seed=0):
+    rng = random.Random(seed)
+    amounts = ["400", "1000", "12.5", "7.", "3.14x", "0"]
+    texts = []
+    for _ in range(size):
+        if rng.random() < 0.3:
+            texts.append("".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 12))))
+            continue
+        text = rng.choice(TEMPLATES).format(name=rng.choice(NAMES), amount=rng.choice(amounts))
+        if rng.random() < 0.2:
+            text = text.upper() if rng.random() < 0.5 else text.swapcase()
+        texts.append(text)
+    return texts
+
+
+def timed(parse_many, texts):
+    start = time.perf_counter()
+    results = parse_many(texts)
+    return time.perf_counter() - start, results
+
+
+def run():
+    texts = corpus()
+    legacy = LegacyParser()
+    parser = NaturalLanguageParser()
+
+    legacy_time, expected = timed(lambda ts: [legacy.parse(t) for t in ts], texts)
+    compiled_time, results = timed(parser.parse_many, texts)
+
+    mismatches = [(t, e, r) for t, e, r in zip(texts, expected, results) if e != r]
+
+    print("\n--- NL PARSER BENCHMARK ---")
+    print(f"utterances: {len(texts)}")
+    print(f"legacy:   {len(texts) / legacy_time:10.0f} /s")
+    print(f"compiled: {len(texts) / compiled_time:10.0f} /s  ({legacy_time / compiled_time:.1f}x)")
+    print(f"mismatches: {len(mismatches)}")
+    for text, e, r in mismatches[:10]:
+        print(f"  {text!r}: expected {e!r}, got {r!r}")
+    return not mismatches
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run() else 1)
@@ -0,0 +1,131 @@
+# ==============================
+# Sarah Task 7 KB Search Benchmark
+# ==============================
+# Offline: uses the local hashing backend and a throwaway database.
+
+import os
+import random
+import sqlite3
+import string
+import tempfile
+import time
+from datetime import datetime
+
+from cloudstaff_core.experiments.kb_ann_index import IVFIndex
+from cloudstaff_core.experiments.kb_embeddings import HashingEmbeddingBackend, load_matrix, normalize, top_k
+from cloudstaff_core.experiments.sarah_task7_kb_search import search_kb
+from cloudstaff_core.storage.connection_pool import get_connection
+
+NUM_ENTRIES = 20000
+NUM_QUERIES = 200
+TOP_N = 10
+CLIENTS = ["Noah", "Olivia", "Ethan", None]
+WORDS = ["invoice", "payment", "refund", "meeting", "schedule", "policy", "mpesa",
+         "bank", "transfer", "balance", "overdue", "contract", "report", "account"]
+
+
+def random_question(rng):
+    words = rng.choices(WORDS, k=rng.randint(3, 7))
+    words.append("".join(rng.choices(string.ascii_lowercase, k=6)))
+    return " ".join(words) + "?"
+
+
+def build_db(path, rng):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE kb_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            client TEXT,
+            question TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            tags TEXT,
+            created_at TEXT NOT NULL
+        )
+    """)
+    now = datetime.now().isoformat()
+    conn.executemany(
+        "INSERT INTO kb_entries (client, question, answer, tags, created_at) VALUES (?, ?, ?, ?, ?)",
+        [(rng.choice(CLIENTS), random_question(rng), f"answer {i}", "bench", now) for i in range(NUM_ENTRIES)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def run():
+    rng = random.Random(7)
+    backend = HashingEmbeddingBackend()
+    queries = [random_question(rng) for _ in range(NUM_QUERIES)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "kb.db")
+        build_db(db_path, rng)
+
+        start = time.perf_counter()
+        search_kb(queries[0], backend=backend, db_path=db_path)
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for q in queries:
+            search_kb(q, backend=backend, db_path=db_path)
+        cached = (time.perf_counter() - start) / NUM_QUERIES
+
+        # Old behaviour: every KB question re-embedded on every search
+        conn = sqlite3.connect(db_path)
+        questions = [r[0] for r in conn.execute("SELECT question FROM kb_entries")]
+        conn.close()
+        start = time.perf_counter()
+        normalize(backend.embed(questions))
+        per_row = time.perf_counter() - start
+
+        ann = benchmark_ann(db_path, backend, queries)
+
+    print("\n--- KB SEARCH BENCHMARK ---")
+    print(f"Entries: {NUM_ENTRIES}, queries: {NUM_QUERIES}, backend: {backend.name}")
+    print(f"First search (embeds all rows once): {first * 1000:.1f} ms")
+    print(f"Cached search, mean:                 {cached * 1000:.2f} ms")
+    print(f"Re-embed-every-row search, one run:  {per_row * 1000:.1f} ms (before network latency)")
+    print(f"IVF build ({ann['lists']} lists):            {ann['build'] * 1000:.1f} ms")
+    for label, exact_ms, ann_ms, recall in ann["rows"]:
+        print(f"{label}: exact {exact_ms:.3f} ms, IVF {ann_ms:.3f} ms, recall@{TOP_N} {recall:.3f}")
+
+
+def benchmark_ann(db_path, backend, queries):
+    """Recall and latency of the IVF index against exact top-k."""
+    conn = get_connection(db_path)
+    ids, _, clients, matrix = load_matrix(conn, backend)
+    ids = list(ids)
+
+    start = time.perf_counter()
+    index = IVFIndex.build_from_db(conn, backend)
+    build = time.perf_counter() - start
+
+    query_vecs = normalize(backend.embed(queries))
+    rows = []
+    for label, client in (("All clients ", None), ("Client Noah ", "Noah")):
+        if client is None:
+            sub_ids, sub_matrix = ids, matrix
+        else:
+            mask = [c == client for c in clients]
+            sub_ids = [i for i, m in zip(ids, mask) if m]
+            sub_matrix = matrix[mask]
+
+        exact_time = ann_time = hits = 0.0
+        for q in query_vecs:
+            start = time.perf_counter()
+            idx, _ = top_k(sub_matrix, q, TOP_N)
+            exact_time += time.perf_counter() - start
+            exact = {sub_ids[i] for i in idx}
+
+            start = time.perf_counter()
+            found, _ = index.search(q, TOP_N, client=client)
+            ann_time += time.perf_counter() - start
+            hits += len(exact & set(int(i) for i in found)) / max(1, len(exact))
+
+        n = len(query_vecs)
+        rows.append((label, exact_time / n * 1000, ann_time / n * 1000, hits / n))
+
+    return {"lists": index.n_lists, "build": build, "rows": rows}
+
+
+if __name__ == "__main__":
+    run()
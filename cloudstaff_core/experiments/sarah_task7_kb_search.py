@@ -1,46 +1,59 @@
-import sqlite3
 import os
-import numpy as np
-from openai import OpenAI
 
-# Setup OpenAI client
-client = OpenAI(api_key="YOUR_OPENAI_KEY")  # Replace with your key
+from cloudstaff_core.experiments.kb_embeddings import (
+    ensure_schema, get_backend, load_matrix, normalize, refresh_embeddings, top_k
+)
+from cloudstaff_core.storage.connection_pool import get_connection
 
 # KB DB path
 DB_PATH = os.path.join(os.path.dirname(__file__), '../data/sarah_kb.db')
 
-# Generate embeddings
-def embed_text(text: str):
-    response = client.embeddings.create(
-        model="text-embedding-3-small",
-        input=text
-    )
-    return np.array(response.data[0].embedding)
+# (db_path, backend, client_filter) -> (db version, answers, matrix)
+_matrix_cache = {}
+
+def _db_version(conn):
+    # data_version moves on commits from other connections, total_changes on ours
+    return conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes
 
 # Search KB by semantic similarity
-def search_kb(query: str, client_filter=None, top_n=3):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    if client_filter:
-        c.execute('SELECT id, question, answer FROM kb_entries WHERE client=?', (client_filter,))
-    else:
-        c.execute('SELECT id, question, answer FROM kb_entries')
-    
-    rows = c.fetchall()
-    conn.close()
-
-    query_vec = embed_text(query)
-    results = []
-    
-    for row in rows:
-        id, q, a = row
-        q_vec = embed_text(q)
-        score = np.dot(query_vec, q_vec) / (np.linalg.norm(query_vec) * np.linalg.norm(q_vec))
-        results.append((score, a))
-    
-    results.sort(reverse=True, key=lambda x: x[0])
-    return [a for _, a in results[:top_n]]
+def search_kb(query: str, client_filter=None, top_n=3, backend=None, db_path=DB_PATH):
+    """
+    Question vectors are cached in kb_entries, so a search costs one
+    embedding call for the query plus a single matrix-vector product.
+    Entries added or edited since the last search are embedded first;
+    while the database is unchanged the loaded matrix is reused.
+    """
+    backend = backend or get_backend()
+    conn = get_connection(db_path)
+    key = (os.path.abspath(db_path), backend.name, client_filter)
+
+    cached = _matrix_cache.get(key)
+    if cached is None or cached[0] != _db_version(conn):
+        ensure_schema(conn)
+        refresh_embeddings(conn, backend)
+        _, answers, _, matrix = load_matrix(conn, backend, client_filter)
+        cached = _matrix_cache[key] = (_db_version(conn), answers, matrix)
+
+    _, answers, matrix = cached
+    query_vec = normalize(backend.embed([query]))[0]
+    idx, _ = top_k(matrix, query_vec, top_n)
+    return [answers[i] for i in idx]
+
+# Approximate search through a prebuilt IVFIndex (see kb_ann_index.py)
+def search_kb_ann(query: str, index, client_filter=None, top_n=3, backend=None, db_path=DB_PATH):
+    backend = backend or get_backend()
+    query_vec = normalize(backend.embed([query]))[0]
+    ids, _ = index.search(query_vec, top_n, client=client_filter)
+    if len(ids) == 0:
+        return []
+
+    conn = get_connection(db_path)
+    placeholders = ",".join("?" * len(ids))
+    rows = dict(conn.execute(
+        f"SELECT id, answer FROM kb_entries WHERE id IN ({placeholders})",
+        [int(i) for i in ids],
+    ).fetchall())
+    return [rows[int(i)] for i in ids if int(i) in rows]
 
 # Example usage
 if __name__ == "__main__":
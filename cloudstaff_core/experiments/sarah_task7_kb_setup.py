@@ -2,6 +2,10 @@ import sqlite3
 from datetime import datetime
 import os
 
+from cloudstaff_core.experiments.kb_embeddings import (
+    backend_unavailable, ensure_schema, get_backend, refresh_embeddings
+)
+
 # Ensure the data directory exists
 os.makedirs(os.path.join(os.path.dirname(__file__), '../data'), exist_ok=True)
 DB_PATH = os.path.join(os.path.dirname(__file__), '../data/sarah_kb.db')
@@ -37,5 +41,15 @@ entries = [
 c.executemany('INSERT INTO kb_entries (client, question, answer, tags, created_at) VALUES (?, ?, ?, ?, ?)', entries)
 
 conn.commit()
+
+# Embed questions once at write time; searches reuse the stored vectors
+ensure_schema(conn)
+reason = backend_unavailable()
+if reason:
+    # The entries are saved; any search embeds whatever is still missing
+    print(f"Skipped embedding questions: {reason}. Fix that or set KB_EMBEDDING_BACKEND=local, "
+          "then run sarah_task7_kb_search.py to embed them.")
+else:
+    print("Embedded questions:", refresh_embeddings(conn, get_backend()))
 conn.close()
 print("✅ Knowledge base initialized with sample entries at:", DB_PATH)
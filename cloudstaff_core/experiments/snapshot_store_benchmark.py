@@ -0,0 +1,111 @@
+# ==============================
+# Snapshot Store Benchmark
+# ==============================
+# Hourly snapshots of a client book where only a few clients change
+# between snapshots. Compares the old one-pretty-printed-file-per-day
+# dump with the content-addressed store: bytes written per snapshot,
+# save time, and time to load the latest snapshot.
+#
+#   python -m cloudstaff_core.experiments.snapshot_store_benchmark [clients]
+
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from cloudstaff_core.storage.snapshot_engine import (
+    load_latest_snapshot,
+    prune_snapshots,
+    save_snapshot,
+)
+
+DEFAULT_CLIENTS = 20_000
+SNAPSHOTS = 24
+CHANGED_SHARE = 0.01
+KEEP = 12
+
+
+def legacy_save(state, directory, hour):
+    # One full dump per snapshot; the old engine keyed files by day, here
+    # by hour so every snapshot is kept and comparable
+    path = os.path.join(directory, f"snapshot_{hour:04d}.json")
+    with open(path, "w") as f:
+        json.dump(state, f, indent=2)
+
+
+def legacy_load(directory):
+    files = sorted(
+        [f for f in os.listdir(directory) if f.startswith("snapshot_")],
+        reverse=True
+    )
+    with open(os.path.join(directory, files[0]), "r") as f:
+        return json.load(f)
+
+
+def dir_bytes(directory):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(directory) for name in names
+    )
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def run(clients=DEFAULT_CLIENTS):
+    rng = random.Random(0)
+    state = {
+        f"Client{i}": {"invoiced": float(rng.randrange(10_000)), "paid": float(rng.randrange(10_000))}
+        for i in range(clients)
+    }
+    legacy_dir, store_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+    names = list(state)
+
+    print("\n--- SNAPSHOT STORE BENCHMARK ---")
+    print(f"{clients} clients, {SNAPSHOTS} snapshots, {CHANGED_SHARE:.1%} changed per snapshot")
+    try:
+        legacy_ms = store_ms = 0.0
+        legacy_growth, store_growth = [], []
+        for hour in range(SNAPSHOTS):
+            for name in rng.sample(names, int(clients * CHANGED_SHARE)):
+                state[name]["paid"] += 100.0
+
+            before = dir_bytes(legacy_dir)
+            ms, _ = timed(lambda: legacy_save(state, legacy_dir, hour))
+            legacy_ms += ms
+            legacy_growth.append(dir_bytes(legacy_dir) - before)
+
+            before = dir_bytes(store_dir)
+            ms, _ = timed(lambda: save_snapshot(state, directory=store_dir))
+            store_ms += ms
+            store_growth.append(dir_bytes(store_dir) - before)
+
+        legacy_load_ms, legacy_state = timed(lambda: legacy_load(legacy_dir))
+        store_load_ms, store_state = timed(lambda: load_latest_snapshot(store_dir))
+        assert legacy_state == store_state == state
+
+        print(f"{'':<8} {'first KB':>9} {'next KB':>9} {'total KB':>9} {'save ms':>8} {'load ms':>8}")
+        for label, growth, save_ms, load_ms, directory in [
+            ("legacy", legacy_growth, legacy_ms, legacy_load_ms, legacy_dir),
+            ("store", store_growth, store_ms, store_load_ms, store_dir),
+        ]:
+            print(f"{label:<8} {growth[0] / 1024:9.0f} {sum(growth[1:]) / len(growth[1:]) / 1024:9.1f} "
+                  f"{dir_bytes(directory) / 1024:9.0f} {save_ms / SNAPSHOTS:8.1f} {load_ms:8.1f}")
+
+        gc_ms, (snapshots, chunks) = timed(lambda: prune_snapshots(KEEP, store_dir))
+        assert load_latest_snapshot(store_dir) == state
+        print(f"\nprune to {KEEP}: {snapshots} snapshots, {chunks} chunks removed in {gc_ms:.1f} ms, "
+              f"store now {dir_bytes(store_dir) / 1024:.0f} KB")
+    finally:
+        shutil.rmtree(legacy_dir)
+        shutil.rmtree(store_dir)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CLIENTS)
@@ -0,0 +1,44 @@
+# ==============================
+# Startup Import Benchmark
+# ==============================
+# Times a cold `import` of the runtime in a fresh interpreter with no
+# LLM credentials present. Importing must succeed offline and should
+# cost little more than the interpreter itself.
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = [
+    "cloudstaff_core",
+    "cloudstaff_core.config.settings",
+    "cloudstaff_core.runtime.run_sarah",
+]
+RUNS = 20
+
+
+def time_import(statement, env):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], env=env, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run():
+    env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+    baseline = time_import("pass", env)
+    print("\n--- STARTUP IMPORT BENCHMARK (no OPENAI_API_KEY) ---")
+    print(f"{'interpreter only':<40} {baseline * 1000:7.1f} ms")
+    for module in MODULES:
+        elapsed = time_import(f"import {module}", env)
+        print(f"{module:<40} {elapsed * 1000:7.1f} ms  (+{(elapsed - baseline) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    run()
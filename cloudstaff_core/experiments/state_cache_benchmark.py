@@ -0,0 +1,61 @@
+# ==============================
+# Workflow State Cache Benchmark
+# ==============================
+# Times CommandRouter transition validation (last state lookup + rule
+# check) for hot clients with the state cache, against the SQLite
+# lookup it replaces. Works on a throwaway copy of the ledger.
+
+import os
+import shutil
+import tempfile
+import time
+
+from cloudstaff_core.agents.sarah import DB_FILE
+from cloudstaff_core.commands.command_router import CommandRouter
+
+CLIENTS = 200
+LOOKUPS = 200_000
+
+
+def per_call_ns(fn, clients, n=LOOKUPS):
+    start = time.perf_counter()
+    for i in range(n):
+        fn(clients[i % len(clients)])
+    return (time.perf_counter() - start) / n * 1e9
+
+
+def run():
+    tmp = tempfile.mkdtemp()
+    db_file = os.path.join(tmp, "sarah.db")
+    shutil.copyfile(DB_FILE, db_file)
+
+    try:
+        router = CommandRouter(db_file)
+        sarah = router.sarah
+        clients = [f"Bench{i}" for i in range(CLIENTS)]
+        with sarah.batch():
+            for name in clients:
+                sarah.client_intake(name)
+
+        def uncached(name):
+            sarah._states.invalidate(name)
+            return sarah.get_last_state(name)
+
+        def validate(name):
+            return router._route("meet", 0.0, sarah.get_last_state(name), None)
+
+        sql_ns = per_call_ns(uncached, clients, LOOKUPS // 10)
+        hit_ns = per_call_ns(sarah.get_last_state, clients)
+        validate_ns = per_call_ns(validate, clients)
+
+        print("\n--- STATE CACHE BENCHMARK ---")
+        print(f"cached entries:             {len(sarah._states)}")
+        print(f"get_last_state (SQLite):    {sql_ns:8.0f} ns")
+        print(f"get_last_state (cache hit): {hit_ns:8.0f} ns")
+        print(f"transition validation:      {validate_ns:8.0f} ns")
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    run()
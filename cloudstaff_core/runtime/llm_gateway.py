@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from cloudstaff_core.config.settings import get_settings
+
+
+# -------------------------------------
+# BACKENDS
+# -------------------------------------
+class OpenAIBackend:
+    def __init__(self, model="gpt-4o-mini", api_key=None):
+        self.model = model
+        self._api_key = api_key
+        self._client = None
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=self._api_key or get_settings().OPENAI_API_KEY)
+
+        response = await self._client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message},
+            ],
+        )
+        return response.choices[0].message.content
+
+
+class FakeBackend:
+    """Offline backend with a fixed simulated latency, for benchmarks."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.calls = 0
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return f"[fake] {user_message}"
+
+
+# -------------------------------------
+# RESPONSE CACHE
+# -------------------------------------
+class ResponseCache:
+    """LRU cache whose entries also expire ttl seconds after insertion."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+@lru_cache(maxsize=64)
+def _prompt_digest(system_prompt: str) -> str:
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+
+
+# -------------------------------------
+# GATEWAY
+# -------------------------------------
+class LLMGateway:
+    """
+    Async front door for chat completions.
+
+    - at most max_concurrency backend calls are in flight
+    - identical concurrent requests share one backend call
+    - answers are cached on (system prompt hash, user message)
+
+    A shared backend call runs in its own task. Cancelling one caller
+    leaves the call running for the others, and the call is cancelled
+    only when no caller is left waiting on it.
+    """
+
+    def __init__(self, backend, max_concurrency: int = 8, cache_size: int = 1024, ttl: float = 300.0):
+        self.backend = backend
+        self.max_concurrency = max_concurrency
+        self.cache = ResponseCache(cache_size, ttl)
+        self._loop = None
+        self._semaphore = None
+        self._inflight = {}  # key -> backend call task
+        self._waiters = {}   # backend call task -> callers awaiting it
+        self.stats = {"hits": 0, "coalesced": 0, "misses": 0}
+
+    def _loop_semaphore(self):
+        # asyncio primitives belong to one event loop, and a long-lived
+        # gateway may outlive several asyncio.run() calls
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        key = (_prompt_digest(system_prompt), user_message)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats["hits"] += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["misses"] += 1
+            task = self._start_call(key, system_prompt, user_message)
+        else:
+            self.stats["coalesced"] += 1
+
+        self._waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task in self._waiters:  # dropped once the call finishes
+                self._waiters[task] -= 1
+                if not self._waiters[task] and not task.done():
+                    # Last caller gone; nobody wants the answer any more
+                    self._forget(key, task)
+                    task.cancel()
+
+    def _start_call(self, key, system_prompt, user_message):
+        semaphore = self._loop_semaphore()
+
+        async def call():
+            async with semaphore:
+                result = await self.backend.complete(system_prompt, user_message)
+            self.cache.put(key, result)
+            return result
+
+        task = asyncio.get_running_loop().create_task(call())
+        self._inflight[key] = task
+        self._waiters[task] = 0
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return task
+
+    def _forget(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        self._waiters.pop(task, None)
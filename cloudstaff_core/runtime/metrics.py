@@ -0,0 +1,223 @@
+# cloudstaff_core/runtime/metrics.py
+# =========================================
+# In-process counters, gauges and latency histograms
+# =========================================
+# Off unless CLOUDSTAFF_METRICS=1 (or enable() is called). Call sites
+# guard on ENABLED, so a disabled metric costs one global lookup and
+# nothing is allocated or locked.
+
+import functools
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+ENABLED = os.environ.get("CLOUDSTAFF_METRICS", "") == "1"
+DUMP_PATH = os.environ.get("CLOUDSTAFF_METRICS_FILE", "metrics.prom")
+
+# Latency buckets in seconds, 1 µs to 10 s
+LATENCY_BUCKETS = (
+    1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4,
+    1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0,
+)
+
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+
+def _label_text(labels, values, extra=""):
+    pairs = [f'{k}="{_escape(v)}"' for k, v in zip(labels, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+# -------------------------------------
+# METRIC TYPES
+# -------------------------------------
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _check(self, values):
+        # Only run when a label set is first seen, to keep updates cheap
+        if len(values) != len(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {values}")
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _label_text(self.labels, k), v) for k, v in items]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            try:
+                self._values[labels] += amount
+            except KeyError:
+                self._check(labels)
+                self._values[labels] = amount
+
+
+class Gauge(Counter):
+    """A counter that may also be set; inc() takes negative amounts."""
+
+    kind = "gauge"
+
+    def set(self, value, *labels):
+        if labels not in self._values:
+            self._check(labels)
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Bucket counts are stored per bucket and made cumulative on output."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                self._check(labels)
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def value(self, *labels):
+        """(count, sum) for one label set."""
+        entry = self._values.get(labels)
+        return (entry[2], entry[1]) if entry else (0, 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._values.items())
+
+        out = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                out.append((f"{self.name}_bucket", _label_text(self.labels, key, f'le="{le}"'), cumulative))
+            out.append((f"{self.name}_sum", _label_text(self.labels, key), total))
+            out.append((f"{self.name}_count", _label_text(self.labels, key), count))
+        return out
+
+
+# -------------------------------------
+# REGISTRY
+# -------------------------------------
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, cls, name, help_text, labels=(), **kwargs):
+        # Get-or-create, so re-importing a module reuses its metrics
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labels, **kwargs)
+            elif type(metric) is not cls or metric.labels != tuple(labels):
+                raise RuntimeError(f"Metric {name} already registered with a different type or labels")
+            return metric
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def reset(self):
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample, labels, value in metric.samples():
+                lines.append(f"{sample}{labels} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path=None):
+        path = path or DUMP_PATH
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+        return path
+
+
+REGISTRY = Registry()
+
+
+def counter(name, help_text, labels=()):
+    return REGISTRY.register(Counter, name, help_text, labels)
+
+
+def gauge(name, help_text, labels=()):
+    return REGISTRY.register(Gauge, name, help_text, labels)
+
+
+def histogram(name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+    return REGISTRY.register(Histogram, name, help_text, labels, buckets=buckets)
+
+
+def dump(path=None):
+    return REGISTRY.dump(path)
+
+
+def timed(hist, *labels):
+    """Decorator: observes the call's duration in `hist` while metrics are enabled."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                hist.observe(perf_counter() - start, *labels)
+        return wrapper
+    return decorate
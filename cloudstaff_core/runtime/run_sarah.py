@@ -1,28 +1,49 @@
-from openai import OpenAI
-from cloudstaff_core.agents.sarah import Sarah
-from cloudstaff_core.config.settings import OPENAI_API_KEY
+import asyncio
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+from cloudstaff_core.commands.command_router import CommandRouter
+from cloudstaff_core.runtime import metrics
+from cloudstaff_core.runtime.llm_gateway import LLMGateway, OpenAIBackend
 
-def run():
-    sarah = Sarah()
+_gateway = None
+
+def get_gateway():
+    # Created on first use so importing this module needs no credentials
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway(OpenAIBackend())
+    return _gateway
+
+def system_prompt():
+    """Sarah's role for the chat model; the command list comes from the router."""
+    commands = ", ".join([*CommandRouter.HANDLERS, "report"])
+    return (
+        "You are Sarah, the ledger assistant for CloudStaff. You explain client "
+        "workflows, invoices, payments and balances. You do not change the ledger "
+        "yourself: operators run commands for that "
+        f"({commands}, each followed by a client name and, for invoice and payment, "
+        "an amount). Answer briefly and never invent figures."
+    )
+
+async def chat():
+    gateway = get_gateway()
+    prompt = system_prompt()
+    loop = asyncio.get_running_loop()
     print("Sarah is online. Type 'exit' to quit.")
 
     while True:
-        user_input = input("You: ")
+        user_input = await loop.run_in_executor(None, input, "You: ")
         if user_input.lower() == "exit":
             break
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": sarah.system_prompt()},
-                {"role": "user", "content": user_input}
-            ]
-        )
+        reply = await gateway.complete(prompt, user_input)
+        print("Sarah:", reply)
 
-        print("Sarah:", response.choices[0].message.content)
+def run():
+    try:
+        asyncio.run(chat())
+    finally:
+        if metrics.ENABLED:
+            print(f"Metrics written to {metrics.dump()}")
 
 if __name__ == "__main__":
     run()
-
@@ -0,0 +1,213 @@
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(__file__)
+EVENTS_FILE = os.path.join(BASE_DIR, "events", "events.jsonl")
+COLUMNAR_DIR = os.path.join(BASE_DIR, "events", "columnar")
+
+SCHEMA = ("timestamp", "client_name", "event_type", "amount", "prev_hash", "event_hash")
+GENESIS_DIGEST = bytes(32)  # prev_hash of the first event
+SEPARATORS = {
+    "compact": (",", ":"),
+    "default": (", ", ": "),
+}
+EVENT_SIGNS = {"INVOICE": 1.0, "PAYMENT": -1.0}
+
+
+# -------------------------------------
+# ENCODING
+# -------------------------------------
+def _digest(value):
+    return GENESIS_DIGEST if value == "GENESIS" else bytes.fromhex(value)
+
+
+def _hexdigest(raw):
+    raw = bytes(raw)
+    return "GENESIS" if raw == GENESIS_DIGEST else raw.hex()
+
+
+def _render(timestamp, client, event_type, amount, extra, prev_hash, event_hash, separators):
+    event = {
+        "timestamp": timestamp,
+        "client_name": client,
+        "event_type": event_type,
+        "amount": amount,
+    }
+    event.update(json.loads(extra))
+    event["prev_hash"] = prev_hash
+    event["event_hash"] = event_hash
+    return json.dumps(event, separators=separators)
+
+
+class _Dictionary:
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def write_columnar(events_path=EVENTS_FILE, directory=COLUMNAR_DIR):
+    """
+    Converts a chained, normalized events.jsonl into typed column files.
+
+    client_name, event_type and any extra fields (e.g. source) are
+    dictionary-encoded; hashes are stored as raw 32-byte digests. Every
+    row is re-rendered and compared with its source line, so a log that
+    cannot be reproduced byte for byte is rejected instead of silently
+    losing information.
+    """
+    timestamps, clients, event_types, amounts, extras = [], [], [], [], []
+    prev_hashes, event_hashes = bytearray(), bytearray()
+    client_dict, type_dict, extra_dict = _Dictionary(), _Dictionary(), _Dictionary()
+    style = None
+
+    with open(events_path, "r", encoding="utf-8") as f:
+        for index, line in enumerate(f, start=1):
+            line = line.rstrip("\n")
+            event = json.loads(line)
+
+            missing = [k for k in SCHEMA if k not in event]
+            if missing or not isinstance(event["amount"], float):
+                raise ValueError(f"Line {index} is not in the canonical schema")
+
+            extra = json.dumps(
+                {k: v for k, v in event.items() if k not in SCHEMA},
+                separators=(",", ":"),
+            )
+            if style is None:
+                style = "compact" if line.startswith('{"timestamp":"') else "default"
+
+            rendered = _render(
+                event["timestamp"], event["client_name"], event["event_type"],
+                event["amount"], extra, event["prev_hash"], event["event_hash"],
+                SEPARATORS[style],
+            )
+            if rendered != line:
+                raise ValueError(f"Line {index} cannot be stored losslessly")
+
+            timestamps.append(event["timestamp"])
+            clients.append(client_dict.encode(event["client_name"]))
+            event_types.append(type_dict.encode(event["event_type"]))
+            amounts.append(event["amount"])
+            extras.append(extra_dict.encode(extra))
+            prev_hashes += _digest(event["prev_hash"])
+            event_hashes += _digest(event["event_hash"])
+
+    columns = {
+        "timestamp": np.array(timestamps, dtype="datetime64[us]"),
+        "client_name": np.array(clients, dtype=np.int32),
+        "event_type": np.array(event_types, dtype=np.int16),
+        "amount": np.array(amounts, dtype=np.float64),
+        "extra": np.array(extras, dtype=np.int32),
+        "prev_hash": np.frombuffer(bytes(prev_hashes), dtype=np.uint8).reshape(-1, 32),
+        "event_hash": np.frombuffer(bytes(event_hashes), dtype=np.uint8).reshape(-1, 32),
+    }
+
+    rendered_ts = [d.isoformat() for d in columns["timestamp"].astype(datetime)]
+    if rendered_ts != timestamps:
+        raise ValueError("Timestamps are not naive microsecond ISO-8601 values")
+
+    os.makedirs(directory, exist_ok=True)
+    for name, column in columns.items():
+        np.save(os.path.join(directory, f"{name}.npy"), column)
+
+    meta = {
+        "rows": len(amounts),
+        "separators": style or "compact",
+        "dictionaries": {
+            "client_name": client_dict.values,
+            "event_type": type_dict.values,
+            "extra": extra_dict.values,
+        },
+    }
+    with open(os.path.join(directory, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    return meta
+
+
+# -------------------------------------
+# DECODING
+# -------------------------------------
+def open_columns(directory=COLUMNAR_DIR):
+    """Memory-maps every column; nothing is read until it is used."""
+    with open(os.path.join(directory, "meta.json"), "r") as f:
+        meta = json.load(f)
+
+    columns = {}
+    for name in ("timestamp", "client_name", "event_type", "amount", "extra", "prev_hash", "event_hash"):
+        columns[name] = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+    return meta, columns
+
+
+def iter_lines(directory=COLUMNAR_DIR, batch_size=10_000):
+    meta, cols = open_columns(directory)
+    dicts = meta["dictionaries"]
+    separators = SEPARATORS[meta["separators"]]
+
+    for start in range(0, meta["rows"], batch_size):
+        stop = min(start + batch_size, meta["rows"])
+        timestamps = cols["timestamp"][start:stop].astype(datetime)
+        for i, row in enumerate(range(start, stop)):
+            yield _render(
+                timestamps[i].isoformat(),
+                dicts["client_name"][cols["client_name"][row]],
+                dicts["event_type"][cols["event_type"][row]],
+                float(cols["amount"][row]),
+                dicts["extra"][cols["extra"][row]],
+                _hexdigest(cols["prev_hash"][row]),
+                _hexdigest(cols["event_hash"][row]),
+                separators,
+            )
+
+
+def write_jsonl(directory=COLUMNAR_DIR, events_path=EVENTS_FILE):
+    tmp_path = f"{events_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for line in iter_lines(directory):
+            f.write(line + "\n")
+    os.replace(tmp_path, events_path)
+
+
+# -------------------------------------
+# AGGREGATIONS
+# -------------------------------------
+def client_totals(directory=COLUMNAR_DIR):
+    """Per-client invoiced and paid totals, computed without JSON parsing."""
+    meta, cols = open_columns(directory)
+    clients = meta["dictionaries"]["client_name"]
+    types = meta["dictionaries"]["event_type"]
+    codes = np.asarray(cols["client_name"])
+    amounts = np.asarray(cols["amount"])
+    event_types = np.asarray(cols["event_type"])
+
+    totals = {}
+    for label, wanted in (("invoiced", "INVOICE"), ("paid", "PAYMENT")):
+        mask = event_types == types.index(wanted) if wanted in types else np.zeros(len(codes), bool)
+        totals[label] = np.bincount(codes[mask], weights=amounts[mask], minlength=len(clients))
+
+    return {
+        name: {"invoiced": float(totals["invoiced"][i]), "paid": float(totals["paid"][i])}
+        for i, name in enumerate(clients)
+    }
+
+
+def client_balances(directory=COLUMNAR_DIR):
+    """Per-client balance (invoiced - paid) as a single bincount reduction."""
+    meta, cols = open_columns(directory)
+    clients = meta["dictionaries"]["client_name"]
+    signs = np.array(
+        [EVENT_SIGNS.get(t, 0.0) for t in meta["dictionaries"]["event_type"]] or [0.0]
+    )
+    weights = np.asarray(cols["amount"]) * signs[np.asarray(cols["event_type"])]
+    balances = np.bincount(np.asarray(cols["client_name"]), weights=weights, minlength=len(clients))
+    return {name: float(balances[i]) for i, name in enumerate(clients)}
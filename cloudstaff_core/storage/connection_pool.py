@@ -0,0 +1,131 @@
+# cloudstaff_core/storage/connection_pool.py
+# =========================================
+# Shared SQLite connections for the ledger
+# =========================================
+
+import os
+import sqlite3
+import threading
+
+JOURNAL_MODE = "WAL"           # readers never block the writer
+SYNCHRONOUS = "NORMAL"         # durable at checkpoints; safe with WAL
+STATEMENT_CACHE_SIZE = 256     # prepared statements kept per connection
+BUSY_TIMEOUT_SECONDS = 5.0
+
+_local = threading.local()
+
+
+class _Shared:
+    """
+    One pooled connection, a count of transactions ended through it and
+    the schema migrations already applied on it.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.ended = 0
+        self.migrated = set()
+
+
+class PooledConnection:
+    """
+    Handle on a per-thread sqlite3.Connection shared by every
+    get_connection() caller for the same file.
+
+    close() hands the connection back to the pool instead of closing
+    it, so existing connect/close call sites keep working unchanged.
+    Like closing a real connection, it rolls back anything the caller
+    left uncommitted. A handle taken while another caller's transaction
+    is pending (a helper called mid-write) is a guest in it: its
+    commit(), rollback() and close() leave that transaction to its
+    owner, and any writes it makes join it.
+    """
+
+    def __init__(self, shared: _Shared):
+        object.__setattr__(self, "_shared", shared)
+        object.__setattr__(self, "_conn", shared.conn)
+        # The pending transaction, if any, is identified by how many
+        # had ended before it; it is someone else's
+        object.__setattr__(self, "_guest_of", shared.ended if shared.conn.in_transaction else None)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    @property
+    def migrated(self):
+        """Names of migrations run on this connection, so each runs once."""
+        return self._shared.migrated
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def _owns_transaction(self):
+        return self._conn.in_transaction and self._guest_of != self._shared.ended
+
+    def executescript(self, script):
+        if self._conn.in_transaction and not self._owns_transaction():
+            # executescript() starts with a COMMIT of whatever is pending
+            raise RuntimeError("executescript() inside another caller's transaction")
+        return self._conn.executescript(script)
+
+    def commit(self):
+        if self._owns_transaction():
+            self._conn.commit()
+            self._shared.ended += 1
+
+    def rollback(self):
+        if self._owns_transaction():
+            self._conn.rollback()
+            self._shared.ended += 1
+
+    def close(self):
+        # Returned to the pool; uncommitted work is discarded as on a real close
+        self.rollback()
+
+
+def open_connection(path: str) -> sqlite3.Connection:
+    """
+    A private connection with the pool's settings, for callers that
+    hold transactions across other code (Sarah.batch()).
+    """
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_SECONDS,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.execute(f"PRAGMA journal_mode={JOURNAL_MODE}")
+    conn.execute(f"PRAGMA synchronous={SYNCHRONOUS}")
+    return conn
+
+
+def get_connection(path: str) -> PooledConnection:
+    """
+    A handle on this thread's shared connection to `path`, opening it
+    on first use. Each call returns a new handle; see PooledConnection.
+    """
+    key = os.path.abspath(path)
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = {}
+
+    shared = pool.get(key)
+    if shared is None:
+        shared = pool[key] = _Shared(open_connection(key))
+    return PooledConnection(shared)
+
+
+def close_thread_connections():
+    pool = getattr(_local, "pool", {})
+    for shared in pool.values():
+        shared.conn.close()
+    pool.clear()
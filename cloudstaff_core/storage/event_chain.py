@@ -0,0 +1,139 @@
+# cloudstaff_core/storage/event_chain.py
+# =========================================
+# Event hashing and chain verification
+# =========================================
+# Shared by the event log readers and writers in storage/ and by the
+# agents that replay or rechain the log.
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def sha256(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def canonical_event_string(event: dict) -> str:
+    """
+    Produce a deterministic string for hashing.
+    Excludes hash fields themselves.
+    """
+    filtered = {
+        k: event[k]
+        for k in sorted(event.keys())
+        if k not in ("event_hash", "prev_hash")
+    }
+    return json.dumps(filtered, sort_keys=True, separators=(",", ":"))
+
+
+# -------------------------------------
+# VERIFICATION
+# -------------------------------------
+def _verify_chunk(path, start: int, end: int) -> dict:
+    """
+    Recomputes every hash in bytes [start, end) of a chained log.
+    The chunk's first prev_hash is taken on trust and returned so the
+    caller can check it against the previous chunk's last hash.
+    Stops at the first failure, reported with a chunk-local line number.
+    """
+    result = {"lines": 0, "first_prev": None, "last_hash": None, "error": None}
+    prev_hash = None
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            result["lines"] += 1
+            local = result["lines"]
+            event = json.loads(line)
+
+            if "event_hash" not in event or "prev_hash" not in event:
+                result["error"] = (local, "missing", None, None)
+                return result
+
+            if prev_hash is None:
+                result["first_prev"] = event["prev_hash"]
+            elif event["prev_hash"] != prev_hash:
+                result["error"] = (local, "break", prev_hash, event["prev_hash"])
+                return result
+
+            expected_hash = sha256(event["prev_hash"] + canonical_event_string(event))
+            if event["event_hash"] != expected_hash:
+                result["error"] = (local, "tamper", None, None)
+                return result
+
+            prev_hash = event["event_hash"]
+            result["last_hash"] = prev_hash
+
+    return result
+
+
+def _raise_chunk_error(line: int, kind: str, expected, found):
+    if kind == "missing":
+        raise RuntimeError(f"INTEGRITY FAILURE: Missing hash fields at line {line}")
+    if kind == "break":
+        raise RuntimeError(
+            f"CHAIN BREAK at line {line}: expected {expected}, found {found}"
+        )
+    raise RuntimeError(f"TAMPER DETECTED at line {line}: hash mismatch")
+
+
+def verify_chunks(chunks, parallel=None, prev_hash: str = "GENESIS") -> dict:
+    """
+    Verifies ordered (path, start, end) chunks, optionally across a
+    process pool, then stitches the boundaries serially. Failures carry
+    the same global line numbers and messages as a serial replay.
+    """
+    if parallel and parallel > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=parallel) as pool:
+            results = list(pool.map(_verify_chunk, *zip(*chunks)))
+    else:
+        results = [_verify_chunk(*chunk) for chunk in chunks]
+
+    lines_before = 0
+    for result in results:
+        error = result["error"]
+
+        if error and error[0] == 1 and error[1] == "missing":
+            _raise_chunk_error(lines_before + 1, *error[1:])
+
+        if result["lines"] and result["first_prev"] != prev_hash:
+            _raise_chunk_error(
+                lines_before + 1, "break", prev_hash, result["first_prev"]
+            )
+
+        if error:
+            _raise_chunk_error(lines_before + error[0], *error[1:])
+
+        if result["lines"]:
+            prev_hash = result["last_hash"]
+        lines_before += result["lines"]
+
+    return {"lines": lines_before, "last_hash": prev_hash}
+
+
+def split_chunks(path, count: int):
+    """Splits a file into roughly equal byte ranges on line boundaries."""
+    size = os.path.getsize(path)
+    if count <= 1 or size == 0:
+        return [(path, 0, size)]
+
+    bounds = [0]
+    with open(path, "rb") as f:
+        for i in range(1, count):
+            f.seek(max(size * i // count, bounds[-1]))
+            f.readline()
+            position = f.tell()
+            if position >= size:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+    bounds.append(size)
+
+    return [(path, a, b) for a, b in zip(bounds, bounds[1:])]
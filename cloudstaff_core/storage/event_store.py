@@ -1,25 +1,133 @@
 import json
 import os
+import threading
+import time
 from datetime import datetime
 
+from cloudstaff_core.storage.mmap_reader import iter_json
+
 BASE_DIR = os.path.dirname(__file__)
 EVENTS_FILE = os.path.join(BASE_DIR, "events", "events.jsonl")
 
 os.makedirs(os.path.dirname(EVENTS_FILE), exist_ok=True)
 
-def log_event(client, action, category, amount=0.0):
-    event = {
+def _build_event(client, action, category, amount):
+    return {
         "timestamp": datetime.utcnow().isoformat(),
         "client": client,
         "action": action,
         "category": category,
         "amount": float(amount)
     }
+
+def log_event(client, action, category, amount=0.0):
+    event = _build_event(client, action, category, amount)
     with open(EVENTS_FILE, "a") as f:
         f.write(json.dumps(event) + "\n")
 
+class EventAppender:
+    """
+    Long-lived group-commit writer for the event log.
+
+    Events are buffered and written with a single write() once
+    max_events are pending or max_delay seconds have passed since the
+    oldest buffered event. fsync=True makes every flush durable.
+    The time threshold is checked on append; call flush() (or leave
+    the with-block) to push out a trailing partial batch.
+    """
+
+    def __init__(self, path=EVENTS_FILE, max_events=1000, max_delay=0.5, fsync=False):
+        self.path = path
+        self.max_events = max_events
+        self.max_delay = max_delay
+        self.fsync = fsync
+        self._buffer = []
+        self._first_buffered_at = None
+        self._lock = threading.Lock()
+        self._file = open(path, "a")
+
+    def log(self, client, action, category, amount=0.0):
+        self.append(_build_event(client, action, category, amount))
+
+    def append(self, event):
+        with self._lock:
+            if not self._buffer:
+                self._first_buffered_at = time.monotonic()
+            self._buffer.append(json.dumps(event) + "\n")
+            if (
+                len(self._buffer) >= self.max_events
+                or time.monotonic() - self._first_buffered_at >= self.max_delay
+            ):
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        self._file.write("".join(self._buffer))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._buffer = []
+        self._first_buffered_at = None
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_locked()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def _matches(event, client, event_type, since, until):
+    if client is not None and event.get("client", event.get("client_name")) != client:
+        return False
+    if event_type is not None and event_type not in (
+        event.get("event_type"), event.get("action"), event.get("type")
+    ):
+        return False
+    timestamp = event.get("timestamp", "")
+    if since is not None and timestamp < since:
+        return False
+    if until is not None and timestamp >= until:
+        return False
+    return True
+
+def iter_events(client=None, event_type=None, since=None, until=None, path=EVENTS_FILE):
+    """
+    Streams events one line at a time; nothing is held beyond the
+    current event. since/until bound the ISO timestamp as [since, until)
+    and accept either strings or datetimes.
+    """
+    if isinstance(since, datetime):
+        since = since.isoformat()
+    if isinstance(until, datetime):
+        until = until.isoformat()
+
+    for _, _, event in iter_json(path):
+        if _matches(event, client, event_type, since, until):
+            yield event
+
+def iter_event_batches(batch_size=1000, **filters):
+    """
+    Bounded-memory mode: yields lists of at most batch_size events.
+    """
+    batch = []
+    for event in iter_events(**filters):
+        batch.append(event)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
 def load_events():
-    if not os.path.exists(EVENTS_FILE):
-        return []
-    with open(EVENTS_FILE, "r") as f:
-        return [json.loads(line) for line in f]
+    return list(iter_events())
@@ -0,0 +1,123 @@
+# cloudstaff_core/storage/ledger_schema.py
+# =========================================
+# Ledger indexes for the hot read paths
+# =========================================
+
+import sqlite3
+
+# name -> indexed columns, with the queries each one serves
+LEDGER_INDEXES = {
+    # Sarah.get_last_state: WHERE client_name = ? ORDER BY id DESC LIMIT 1
+    "idx_ledger_client_id": ("client_name", "id"),
+    # dayN overdue_clients: WHERE type = ? AND state = ? AND date <= ?
+    # GROUP BY client_name. client_name before date keeps the groups in
+    # index order, and date/amount make it covering.
+    "idx_ledger_type_state_client": ("type", "state", "client_name", "date", "amount"),
+    # dayN high_value_clients: WHERE type = ? GROUP BY client_name, and
+    # client_report: WHERE client_name = ? AND type = ? (covering for both)
+    "idx_ledger_type_client_amount": ("type", "client_name", "amount"),
+}
+
+# Superseded indexes, dropped by migrate_indexes
+RETIRED_INDEXES = ("idx_ledger_type_state_date",)
+
+
+def ledger_columns(conn):
+    return {row[1] for row in conn.execute("PRAGMA table_info(ledger)")}
+
+
+def migrate_indexes(conn):
+    """
+    Creates any missing ledger indexes. Indexes over columns the table
+    does not have yet (type/state before sarah_db_upgrade.py) are
+    skipped and picked up on a later run. Retired indexes are dropped.
+    Returns the names created.
+    """
+    columns = ledger_columns(conn) | {"id"}
+    existing = {
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'ledger'"
+        )
+    }
+
+    dropped = [name for name in RETIRED_INDEXES if name in existing]
+    for name in dropped:
+        conn.execute(f"DROP INDEX {name}")
+
+    created = []
+    for name, index_columns in LEDGER_INDEXES.items():
+        if name in existing or not set(index_columns) <= columns:
+            continue
+        conn.execute(f"CREATE INDEX {name} ON ledger ({', '.join(index_columns)})")
+        created.append(name)
+
+    # Commit only our own DDL; an unchanged schema leaves any open
+    # transaction (e.g. an enclosing Sarah.batch()) alone
+    if created or dropped:
+        conn.execute("ANALYZE ledger")
+        conn.commit()
+    return created
+
+
+# -------------------------------------
+# FULL-TEXT SEARCH
+# -------------------------------------
+# External-content FTS5 index over the ledger's text columns, kept in
+# sync by triggers so every writer (Sarah._persist, dayN inserts, bulk
+# loads) is covered without code changes.
+LEDGER_FTS = "ledger_fts"
+LEDGER_FTS_COLUMNS = ("client_name", "description", "notes")
+
+
+def fts_available(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def has_fts(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (LEDGER_FTS,)
+    ).fetchone() is not None
+
+
+def migrate_fts(conn):
+    """
+    Creates ledger_fts and its sync triggers, and indexes the existing
+    rows. Returns True when the index is in place, False if this SQLite
+    build has no FTS5 or the ledger lacks the text columns.
+    """
+    if has_fts(conn):
+        return True
+    if not set(LEDGER_FTS_COLUMNS) <= ledger_columns(conn) or not fts_available(conn):
+        return False
+
+    cols = ", ".join(LEDGER_FTS_COLUMNS)
+    new = ", ".join(f"new.{c}" for c in LEDGER_FTS_COLUMNS)
+    old = ", ".join(f"old.{c}" for c in LEDGER_FTS_COLUMNS)
+
+    conn.executescript(f"""
+        BEGIN;
+        CREATE VIRTUAL TABLE {LEDGER_FTS} USING fts5(
+            {cols},
+            content='ledger', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+        CREATE TRIGGER ledger_fts_insert AFTER INSERT ON ledger BEGIN
+            INSERT INTO {LEDGER_FTS}(rowid, {cols}) VALUES (new.id, {new});
+        END;
+        CREATE TRIGGER ledger_fts_delete AFTER DELETE ON ledger BEGIN
+            INSERT INTO {LEDGER_FTS}({LEDGER_FTS}, rowid, {cols}) VALUES ('delete', old.id, {old});
+        END;
+        CREATE TRIGGER ledger_fts_update AFTER UPDATE OF {cols} ON ledger BEGIN
+            INSERT INTO {LEDGER_FTS}({LEDGER_FTS}, rowid, {cols}) VALUES ('delete', old.id, {old});
+            INSERT INTO {LEDGER_FTS}(rowid, {cols}) VALUES (new.id, {new});
+        END;
+        INSERT INTO {LEDGER_FTS}({LEDGER_FTS}) VALUES ('rebuild');
+        COMMIT;
+    """)
+    return True
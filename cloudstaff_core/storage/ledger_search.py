@@ -0,0 +1,118 @@
+# cloudstaff_core/storage/ledger_search.py
+# =========================================
+# Ranked full-text search over the ledger
+# =========================================
+
+import json
+import re
+
+from cloudstaff_core.storage.ledger_schema import LEDGER_FTS, migrate_fts
+
+RESULT_COLUMNS = ("client_name", "description", "type", "amount")
+
+# bm25 weight per indexed column: client_name, description, notes
+BM25_WEIGHTS = (10.0, 2.0, 1.0)
+
+
+def match_expression(query: str):
+    """
+    FTS5 MATCH string for free text. "Double quoted" parts match as
+    phrases, other words as prefixes ("noa" finds "Noah"), and every
+    term must match. FTS operators in the input are never interpreted.
+    Returns None when the text has no searchable words.
+    """
+    terms = []
+    for phrase, words in re.findall(r'"([^"]*)"|([^"\s]+)', query or ""):
+        if phrase:
+            tokens = re.findall(r"\w+", phrase)
+            if tokens:
+                terms.append('"' + " ".join(tokens) + '"')
+        else:
+            terms.extend(f'"{token}"*' for token in re.findall(r"\w+", words))
+    return " ".join(terms) or None
+
+
+def _ensure_fts(conn):
+    # Once per pooled connection; a plain sqlite3 connection is checked
+    # on every call, so long-lived callers should use the pool
+    migrated = getattr(conn, "migrated", None)
+    if migrated is not None and LEDGER_FTS in migrated:
+        return True
+    ready = migrate_fts(conn)
+    if ready and migrated is not None:
+        migrated.add(LEDGER_FTS)
+    return ready
+
+
+def search_ledger(
+    conn,
+    query: str,
+    types=None,
+    states=None,
+    where: str = None,
+    params=(),
+    order_by: str = None,
+    limit: int = None,
+    columns=RESULT_COLUMNS,
+):
+    """
+    Ledger rows whose client name, description or notes match `query`,
+    best bm25 rank first unless `order_by` says otherwise.
+
+    types/states restrict the row type/state; `where` (with `params`) is
+    an extra SQL condition on ledger columns. Without FTS5 in this SQLite
+    build it falls back to an unranked LIKE scan.
+    """
+    expression = match_expression(query)
+    if expression is None:
+        return []
+
+    filters, filter_params = [], []
+    if types:
+        filters.append("type IN (SELECT value FROM json_each(?))")
+        filter_params.append(json.dumps(list(types)))
+    if states:
+        filters.append("state IN (SELECT value FROM json_each(?))")
+        filter_params.append(json.dumps(list(states)))
+    if where:
+        filters.append(f"({where})")
+        filter_params.extend(params)
+
+    select = ", ".join(f"ledger.{c}" for c in columns)
+    tail = ""
+    if limit is not None:
+        tail = " LIMIT ?"
+        filter_params.append(limit)
+
+    cursor = conn.cursor()
+    if _ensure_fts(conn):
+        weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+        filters_sql = "".join(f" AND {f}" for f in filters)
+        cursor.execute(
+            f"""
+            SELECT {select}
+            FROM (
+                SELECT rowid AS hit_id, bm25({LEDGER_FTS}, {weights}) AS hit_rank
+                FROM {LEDGER_FTS} WHERE {LEDGER_FTS} MATCH ?
+            ) AS hits
+            JOIN ledger ON ledger.id = hits.hit_id
+            WHERE 1{filters_sql}
+            ORDER BY {order_by or 'hits.hit_rank'}{tail}
+            """,
+            [expression] + filter_params,
+        )
+    else:
+        pattern = f"%{query.strip()}%"
+        filters_sql = "".join(f" AND {f}" for f in filters)
+        cursor.execute(
+            f"""
+            SELECT {select} FROM ledger
+            WHERE (client_name LIKE ? OR description LIKE ? OR notes LIKE ?){filters_sql}
+            ORDER BY {order_by or 'ledger.id'}{tail}
+            """,
+            [pattern, pattern, pattern] + filter_params,
+        )
+
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
@@ -0,0 +1,160 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"CSLIDX01"
+INDEX_TAIL = 64  # bytes of the log remembered in the header to spot rewrites
+_HEADER = struct.Struct(f"<8sQ{INDEX_TAIL}s")
+
+
+def _map(path):
+    f = open(path, "rb")
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    finally:
+        f.close()  # the mapping keeps its own handle
+    return mm
+
+
+def _unmap(mm, view):
+    view.release()
+    try:
+        mm.close()
+    except BufferError:
+        pass  # a caller still holds a slice; the mapping closes with it
+
+
+def iter_lines(path, start=0):
+    """
+    Yields (offset, next_offset, view) for every line from byte `start`.
+
+    `view` is a zero-copy memoryview over the mapped file without its
+    trailing newline; decode it (bytes(view)) only if the line is
+    needed. Views are only guaranteed valid until the next iteration.
+    """
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    if size <= start:
+        return
+
+    mm = _map(path)
+    view = memoryview(mm)
+    try:
+        position = start
+        while position < size:
+            newline = mm.find(b"\n", position)
+            stop = size if newline == -1 else newline
+            end = size if newline == -1 else newline + 1
+            yield position, end, view[position:stop]
+            position = end
+    finally:
+        _unmap(mm, view)
+
+
+def iter_json(path, start=0):
+    """Yields (offset, next_offset, event), skipping blank lines."""
+    for offset, end, view in iter_lines(path, start):
+        raw = bytes(view)
+        if raw.strip():
+            yield offset, end, json.loads(raw)
+
+
+# -------------------------------------
+# LINE-OFFSET INDEX
+# -------------------------------------
+class LineIndex:
+    """
+    Start offset of every line in a log, persisted next to it as
+    <log>.idx for O(1) seeks to event N.
+
+    The sidecar remembers the log size it covers and the bytes just
+    before that point. An appended-to log only has its new tail indexed;
+    a truncated or rewritten one is re-indexed from scratch.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.index_path = self.path + INDEX_SUFFIX
+        self.offsets = array("Q")
+        self.size = 0
+        self.refresh()
+
+    def _tail(self, f, size):
+        start = max(0, size - INDEX_TAIL)
+        f.seek(start)
+        return f.read(size - start)
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return False
+
+        with open(self.index_path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return False
+            magic, size, tail = _HEADER.unpack(header)
+            if magic != INDEX_MAGIC:
+                return False
+            offsets = array("Q")
+            offsets.frombytes(f.read())
+
+        if os.path.getsize(self.path) < size:
+            return False
+        with open(self.path, "rb") as f:
+            if self._tail(f, size).ljust(INDEX_TAIL, b"\0") != tail:
+                return False
+
+        self.offsets, self.size = offsets, size
+        return True
+
+    def _save(self):
+        with open(self.path, "rb") as f:
+            tail = self._tail(f, self.size)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(INDEX_MAGIC, self.size, tail))
+            self.offsets.tofile(f)
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self):
+        """Brings the index up to date with the log; returns self."""
+        if not os.path.exists(self.path):
+            self.offsets, self.size = array("Q"), 0
+            return self
+
+        if not self._load():
+            self.offsets, self.size = array("Q"), 0
+
+        current = os.path.getsize(self.path)
+        if current == self.size:
+            return self
+
+        for offset, end, _ in iter_lines(self.path, self.size):
+            if end == current and not self._ends_with_newline(end):
+                break  # a partial last line is indexed once it is complete
+            self.offsets.append(offset)
+            self.size = end
+
+        self._save()
+        return self
+
+    def _ends_with_newline(self, end):
+        with open(self.path, "rb") as f:
+            f.seek(end - 1)
+            return f.read(1) == b"\n"
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def line(self, n):
+        """Raw bytes of line n (0-based), without the newline."""
+        start = self.offsets[n]
+        end = self.offsets[n + 1] if n + 1 < len(self.offsets) else self.size
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start).rstrip(b"\n")
+
+    def event(self, n):
+        return json.loads(self.line(n))
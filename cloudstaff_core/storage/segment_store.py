@@ -0,0 +1,339 @@
+import json
+import os
+from datetime import datetime
+
+from cloudstaff_core.storage.event_chain import (
+    canonical_event_string,
+    sha256,
+    split_chunks,
+    verify_chunks,
+)
+
+BASE_DIR = os.path.dirname(__file__)
+SEGMENTS_DIR = os.path.join(BASE_DIR, "events", "segments")
+MANIFEST_NAME = "manifest.json"
+SEGMENT_MAX_EVENTS = 100_000
+
+os.makedirs(SEGMENTS_DIR, exist_ok=True)
+
+
+def segment_name(number):
+    return f"events-{number:06d}.jsonl"
+
+
+def load_manifest(segments_dir=SEGMENTS_DIR):
+    path = os.path.join(segments_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"segments": []}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, segments_dir=SEGMENTS_DIR):
+    path = os.path.join(segments_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _overlaps(entry, since, until):
+    if entry["lines"] == 0:
+        return False
+    if since is not None and entry["last_timestamp"] < since:
+        return False
+    if until is not None and entry["first_timestamp"] >= until:
+        return False
+    return True
+
+
+class SegmentedEventLog:
+    """
+    Hash-chained event log split into fixed-size segments.
+
+    Only the last segment is ever opened for writing. Once it holds
+    max_events lines it is sealed and a new one is started; sealed
+    segments are immutable. The manifest records, per segment, the
+    first/last event_hash, the prev_hash it chains from, its line and
+    byte counts and the timestamp range, so readers can skip or fan
+    out over whole segments without opening them.
+    """
+
+    def __init__(self, segments_dir=SEGMENTS_DIR, max_events=SEGMENT_MAX_EVENTS):
+        self.segments_dir = segments_dir
+        self.max_events = max_events
+        os.makedirs(segments_dir, exist_ok=True)
+        self.manifest = load_manifest(segments_dir)
+        self._recover_active()
+
+    # -------------------------------------
+    # MANIFEST
+    # -------------------------------------
+    def segment_path(self, entry):
+        return os.path.join(self.segments_dir, entry["name"])
+
+    @property
+    def last_hash(self):
+        segments = self.manifest["segments"]
+        if not segments:
+            return "GENESIS"
+        return segments[-1]["last_hash"] or segments[-1]["prev_hash"]
+
+    def _active(self):
+        segments = self.manifest["segments"]
+        if segments and not segments[-1]["sealed"]:
+            return segments[-1]
+        return self._new_entry()
+
+    def _new_entry(self):
+        segments = self.manifest["segments"]
+        entry = {
+            "name": segment_name(len(segments) + 1),
+            "number": len(segments) + 1,
+            "prev_hash": self.last_hash,
+            "first_hash": None,
+            "last_hash": None,
+            "lines": 0,
+            "bytes": 0,
+            "first_timestamp": None,
+            "last_timestamp": None,
+            "sealed": False,
+        }
+        segments.append(entry)
+        return entry
+
+    def _recover_active(self):
+        """
+        Repairs the tail after a crash between a segment write and the
+        manifest save: complete, correctly chained lines past the
+        manifest's byte count are folded in, and a segment file the
+        manifest does not list yet is adopted the same way. Anything
+        else past the last good line (a torn write, a line that does not
+        chain) is truncated away.
+        """
+        segments = self.manifest["segments"]
+        changed = False
+
+        if segments and not segments[-1]["sealed"]:
+            changed = self._fold_tail(segments[-1])
+        else:
+            path = os.path.join(self.segments_dir, segment_name(len(segments) + 1))
+            if os.path.exists(path):
+                entry = self._new_entry()
+                self._fold_tail(entry)
+                if not entry["lines"]:
+                    segments.pop()
+                    os.remove(path)
+                changed = True
+
+        if segments and not segments[-1]["sealed"] and segments[-1]["lines"] >= self.max_events:
+            segments[-1]["sealed"] = True
+            changed = True
+        if changed:
+            save_manifest(self.manifest, self.segments_dir)
+
+    def _fold_tail(self, entry):
+        """Records lines past entry["bytes"]; returns True if the file changed state."""
+        path = self.segment_path(entry)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        if size < entry["bytes"]:
+            raise RuntimeError(f"Segment {entry['name']} truncated below manifest size")
+        if size == entry["bytes"]:
+            return False
+
+        prev_hash = entry["last_hash"] or entry["prev_hash"]
+        with open(path, "rb") as f:
+            f.seek(entry["bytes"])
+            for line in f:
+                try:
+                    event = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    event = None
+                if (
+                    event is None
+                    or event.get("prev_hash") != prev_hash
+                    or event.get("event_hash") != sha256(prev_hash + canonical_event_string(event))
+                ):
+                    break
+                self._record(entry, event, len(line))
+                prev_hash = event["event_hash"]
+
+        if entry["bytes"] < size:
+            with open(path, "r+b") as f:
+                f.truncate(entry["bytes"])
+        return True
+
+    @staticmethod
+    def _record(entry, event, size):
+        if entry["first_hash"] is None:
+            entry["first_hash"] = event["event_hash"]
+            entry["first_timestamp"] = event.get("timestamp")
+        entry["last_hash"] = event["event_hash"]
+        entry["last_timestamp"] = event.get("timestamp")
+        entry["lines"] += 1
+        entry["bytes"] += size
+
+    # -------------------------------------
+    # WRITES
+    # -------------------------------------
+    def append(self, event):
+        return self.append_many([event])[0]
+
+    def append_many(self, events):
+        """
+        Chains and appends events, rolling to a new segment whenever
+        the active one fills up. Each touched segment receives a single
+        write. The manifest is saved as each segment is sealed, before
+        the next one is created, and once more at the end.
+        """
+        if not events:
+            return []
+
+        chained = []
+        prev_hash = self.last_hash
+        pending = []
+        entry = self._active()
+
+        for event in events:
+            event = dict(event)
+            event.pop("prev_hash", None)
+            event.pop("event_hash", None)
+            event.setdefault("timestamp", datetime.utcnow().isoformat())
+            event["prev_hash"] = prev_hash
+            event["event_hash"] = sha256(prev_hash + canonical_event_string(event))
+            prev_hash = event["event_hash"]
+
+            line = json.dumps(event, separators=(",", ":")) + "\n"
+            self._record(entry, event, len(line.encode("utf-8")))
+            pending.append(line)
+            chained.append(event)
+
+            if entry["lines"] >= self.max_events:
+                self._write(entry, pending)
+                pending = []
+                entry["sealed"] = True
+                save_manifest(self.manifest, self.segments_dir)
+                entry = self._active()
+
+        self._write(entry, pending)
+        save_manifest(self.manifest, self.segments_dir)
+        return chained
+
+    def _write(self, entry, lines):
+        if not lines:
+            return
+        with open(self.segment_path(entry), "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+    def seal(self):
+        segments = self.manifest["segments"]
+        if segments and not segments[-1]["sealed"] and segments[-1]["lines"]:
+            segments[-1]["sealed"] = True
+            save_manifest(self.manifest, self.segments_dir)
+
+    # -------------------------------------
+    # READS
+    # -------------------------------------
+    def segments(self, since=None, until=None):
+        """Manifest entries whose time range overlaps [since, until)."""
+        if isinstance(since, datetime):
+            since = since.isoformat()
+        if isinstance(until, datetime):
+            until = until.isoformat()
+        return [e for e in self.manifest["segments"] if _overlaps(e, since, until)]
+
+    def iter_events(self, since=None, until=None):
+        if isinstance(since, datetime):
+            since = since.isoformat()
+        if isinstance(until, datetime):
+            until = until.isoformat()
+
+        for entry in self.segments(since, until):
+            with open(self.segment_path(entry), "r", encoding="utf-8") as f:
+                for line in f:
+                    event = json.loads(line)
+                    timestamp = event.get("timestamp", "")
+                    if since is not None and timestamp < since:
+                        continue
+                    if until is not None and timestamp >= until:
+                        continue
+                    yield event
+
+    def verify(self, parallel=None):
+        """
+        Verifies the whole chain, one segment per work unit. Besides
+        the hash and link checks, each segment must still agree with
+        its manifest entry, which catches rewritten sealed segments.
+        """
+        segments = [e for e in self.manifest["segments"] if e["lines"]]
+        chunks = [
+            (self.segment_path(e), 0, os.path.getsize(self.segment_path(e)))
+            for e in segments
+        ]
+        result = verify_chunks(chunks, parallel=parallel)
+
+        for entry, (path, _, size) in zip(segments, chunks):
+            if size != entry["bytes"]:
+                raise RuntimeError(
+                    f"Segment {entry['name']} size {size} differs from manifest {entry['bytes']}"
+                )
+        for entry, nxt in zip(segments, segments[1:]):
+            if nxt["prev_hash"] != entry["last_hash"]:
+                raise RuntimeError(
+                    f"Manifest chain break between {entry['name']} and {nxt['name']}"
+                )
+        if segments and result["last_hash"] != segments[-1]["last_hash"]:
+            raise RuntimeError("Manifest last_hash does not match the verified chain")
+
+        return result
+
+
+def migrate_from_jsonl(
+    path,
+    segments_dir=SEGMENTS_DIR,
+    max_events=SEGMENT_MAX_EVENTS,
+    batch_size=10_000,
+    parallel=None,
+):
+    """
+    Copies a single-file log into an empty segment store. Everything
+    is validated before anything is written: the source chain must
+    verify from GENESIS, and every event must already carry the
+    fields append_many would otherwise fill in, so re-chaining
+    reproduces the original hashes exactly.
+    """
+    log = SegmentedEventLog(segments_dir, max_events)
+    if log.manifest["segments"]:
+        raise RuntimeError("Segment store is not empty")
+
+    workers = parallel if parallel and parallel > 1 else 1
+    source = verify_chunks(split_chunks(path, workers * 4 if workers > 1 else 1), parallel=workers)
+    _check_rechainable(path)
+
+    batch = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                log.append_many(batch)
+                batch = []
+    if batch:
+        log.append_many(batch)
+
+    if log.last_hash != source["last_hash"]:  # guarded by the checks above
+        raise RuntimeError("Migrated chain does not reproduce the source log's hashes")
+    return log
+
+
+def _check_rechainable(path):
+    # A verified chain only re-chains differently if append_many has to
+    # fill in a timestamp, which would change that event's hash
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip() and "timestamp" not in json.loads(line):
+                raise RuntimeError(
+                    f"Event at line {number} has no timestamp; re-chaining would change its hash"
+                )
@@ -1,24 +1,243 @@
+import hashlib
 import json
 import os
-from datetime import date
+import zlib
+from datetime import datetime
+from time import perf_counter
+
+from cloudstaff_core.runtime import metrics
 
 BASE_DIR = os.path.dirname(__file__)
 SNAPSHOT_DIR = os.path.join(BASE_DIR, "snapshots")
 
 os.makedirs(SNAPSHOT_DIR, exist_ok=True)
 
-def save_snapshot(state):
-    filename = f"snapshot_{date.today().isoformat()}.json"
-    path = os.path.join(SNAPSHOT_DIR, filename)
-    with open(path, "w") as f:
-        json.dump(state, f, indent=2)
+# Layout under the snapshot directory:
+#   chunks/<h[:2]>/<h>.json   {client: state} for a run of clients, named by sha256
+#   manifests/<id>.json       chunk hashes making up one snapshot
+#   index.json                snapshot ids, oldest first
+#   LATEST                    id of the newest snapshot
+CHUNKS = "chunks"
+MANIFESTS = "manifests"
+INDEX = "index.json"
+LATEST = "LATEST"
+
+# Clients are sorted by name and cut into chunks after every client whose
+# name hashes to 0 mod this, so chunks average this many clients and a
+# new or removed client only changes the chunk it falls in.
+CHUNK_CLIENTS = 16
+
+SAVE_SECONDS = metrics.histogram("snapshot_save_seconds", "save_snapshot latency")
+LOAD_SECONDS = metrics.histogram("snapshot_load_seconds", "load_snapshot latency")
+CHUNK_RESULTS = metrics.counter(
+    "snapshot_chunks_total", "Chunks referenced by saved snapshots", ("result",)
+)
+WRITTEN_BYTES = metrics.counter("snapshot_written_bytes_total", "Chunk bytes written")
+COLLECTED_CHUNKS = metrics.counter(
+    "snapshot_collected_chunks_total", "Unreferenced chunks deleted by collect_garbage"
+)
+
+
+def _encode(value) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _write_atomic(path, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path, default=None):
+    try:
+        with open(path, "rb") as f:
+            return json.loads(f.read())
+    except FileNotFoundError:
+        return default
+
+
+def _chunk_path(directory, digest):
+    return os.path.join(directory, CHUNKS, digest[:2], f"{digest}.json")
+
+
+def _read_chunk(directory, digest):
+    """A chunk's {client: state}, or None if missing; fails if its content no longer hashes to its name."""
+    try:
+        with open(_chunk_path(directory, digest), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise RuntimeError(f"Snapshot chunk {digest} is corrupted: content hash mismatch")
+    return json.loads(data)
+
+
+def _manifest_path(directory, snapshot_id):
+    return os.path.join(directory, MANIFESTS, f"{snapshot_id}.json")
+
+
+def _split_chunks(state):
+    chunk = {}
+    for client in sorted(state):
+        chunk[client] = state[client]
+        if zlib.crc32(client.encode("utf-8")) % CHUNK_CLIENTS == 0:
+            yield chunk
+            chunk = {}
+    if chunk:
+        yield chunk
+
+
+def _new_id(index):
+    snapshot_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S%fZ")
+    if index and snapshot_id <= index[-1]:
+        snapshot_id = f"{index[-1]}.{len(index)}"  # same microsecond; keep ids ordered
+    return snapshot_id
+
+
+# -------------------------------------
+# WRITE
+# -------------------------------------
+def save_snapshot(state, keep=None, directory=SNAPSHOT_DIR):
+    """
+    Stores {client: client_state} as content-addressed chunks. Chunks
+    already written by an earlier snapshot are reused, so a snapshot of
+    mostly-unchanged state only writes the chunks holding changed clients.
+    keep=N prunes to the N newest snapshots afterwards. Returns the id.
+    """
+    start = perf_counter() if metrics.ENABLED else None
+    written = written_bytes = 0
+
+    index = _read_json(os.path.join(directory, INDEX), [])
+    previous = load_manifest(index[-1], directory) if index else None
+    known = set(previous["chunks"]) if previous else set()
 
-def load_latest_snapshot():
+    chunks = []
+    for chunk in _split_chunks(state):
+        data = _encode(chunk)
+        digest = hashlib.sha256(data).hexdigest()
+        chunks.append(digest)
+        if digest not in known:
+            path = _chunk_path(directory, digest)
+            if not os.path.exists(path):
+                _write_atomic(path, data)
+                written += 1
+                written_bytes += len(data)
+            known.add(digest)
+
+    snapshot_id = _new_id(index)
+    manifest = {
+        "id": snapshot_id,
+        "created": datetime.utcnow().isoformat(),
+        "clients": len(state),
+        "chunks": chunks,
+    }
+    _write_atomic(_manifest_path(directory, snapshot_id), _encode(manifest))
+
+    index.append(snapshot_id)
+    _write_atomic(os.path.join(directory, INDEX), _encode(index))
+    _write_atomic(os.path.join(directory, LATEST), snapshot_id.encode("utf-8"))
+
+    if start is not None:
+        SAVE_SECONDS.observe(perf_counter() - start)
+        CHUNK_RESULTS.inc("written", amount=written)
+        CHUNK_RESULTS.inc("reused", amount=len(chunks) - written)
+        WRITTEN_BYTES.inc(amount=written_bytes)
+
+    if keep is not None:
+        prune_snapshots(keep, directory)
+    return snapshot_id
+
+
+# -------------------------------------
+# READ
+# -------------------------------------
+def load_manifest(snapshot_id, directory=SNAPSHOT_DIR):
+    return _read_json(_manifest_path(directory, snapshot_id))
+
+
+@metrics.timed(LOAD_SECONDS)
+def load_snapshot(snapshot_id, directory=SNAPSHOT_DIR):
+    manifest = load_manifest(snapshot_id, directory)
+    if manifest is None:
+        raise RuntimeError(f"Snapshot {snapshot_id} not found")
+
+    state = {}
+    for digest in manifest["chunks"]:
+        chunk = _read_chunk(directory, digest)
+        if chunk is None:
+            raise RuntimeError(f"Snapshot {snapshot_id}: missing chunk {digest}")
+        state.update(chunk)
+    return state
+
+
+def load_latest_snapshot(directory=SNAPSHOT_DIR):
+    """Newest snapshot via the LATEST pointer; no directory listing."""
+    try:
+        with open(os.path.join(directory, LATEST), "r", encoding="utf-8") as f:
+            snapshot_id = f.read().strip()
+    except FileNotFoundError:
+        return _load_legacy_snapshot(directory)
+    return load_snapshot(snapshot_id, directory)
+
+
+def _load_legacy_snapshot(directory):
+    # Daily full dumps written before the chunk store existed
     files = sorted(
-        [f for f in os.listdir(SNAPSHOT_DIR) if f.startswith("snapshot_")],
+        [f for f in os.listdir(directory) if f.startswith("snapshot_")],
         reverse=True
     )
     if not files:
         return {}
-    with open(os.path.join(SNAPSHOT_DIR, files[0]), "r") as f:
+    with open(os.path.join(directory, files[0]), "r") as f:
         return json.load(f)
+
+
+# -------------------------------------
+# RETENTION
+# -------------------------------------
+def prune_snapshots(keep, directory=SNAPSHOT_DIR):
+    """
+    Keeps the `keep` newest snapshots, deletes older manifests, then
+    garbage-collects chunks no remaining snapshot references.
+    Returns (snapshots removed, chunks removed).
+    """
+    index = _read_json(os.path.join(directory, INDEX), [])
+    if keep < 1:
+        raise ValueError("keep must be at least 1")
+    if len(index) <= keep:
+        return 0, 0
+
+    dropped, index = index[:-keep], index[-keep:]
+    _write_atomic(os.path.join(directory, INDEX), _encode(index))
+    for snapshot_id in dropped:
+        try:
+            os.remove(_manifest_path(directory, snapshot_id))
+        except FileNotFoundError:
+            pass
+
+    return len(dropped), collect_garbage(directory)
+
+
+def collect_garbage(directory=SNAPSHOT_DIR):
+    """Deletes chunks not referenced by any indexed snapshot."""
+    referenced = set()
+    for snapshot_id in _read_json(os.path.join(directory, INDEX), []):
+        manifest = load_manifest(snapshot_id, directory)
+        if manifest:
+            referenced.update(manifest["chunks"])
+
+    removed = 0
+    chunks_dir = os.path.join(directory, CHUNKS)
+    if not os.path.isdir(chunks_dir):
+        return removed
+    for prefix in os.listdir(chunks_dir):
+        for name in os.listdir(os.path.join(chunks_dir, prefix)):
+            if name.endswith(".json") and name[:-5] not in referenced:
+                os.remove(os.path.join(chunks_dir, prefix, name))
+                removed += 1
+
+    if metrics.ENABLED:
+        COLLECTED_CHUNKS.inc(amount=removed)
+    return removed
@@ -1,14 +1,14 @@
 import json
 from pathlib import Path
 
-EVENTS_PATH = Path("cloudstaff_core/storage/events/events.jsonl")
+from cloudstaff_core.storage.mmap_reader import iter_lines
 
-with open(EVENTS_PATH, "r") as f:
-    for i, line in enumerate(f, start=1):
-        try:
-            e = json.loads(line)
-            _ = e["client_name"]  # check key
-            _ = e["type"]
-        except KeyError:
-            print(f"Malformed event at line {i}: {line.strip()}")
+EVENTS_PATH = Path("cloudstaff_core/storage/events/events.jsonl")
 
+for i, (_, _, line) in enumerate(iter_lines(EVENTS_PATH), start=1):
+    try:
+        e = json.loads(bytes(line))
+        _ = e["client_name"]  # check key
+        _ = e["type"]
+    except KeyError:
+        print(f"Malformed event at line {i}: {bytes(line).decode().strip()}")
@@ -0,0 +1,9 @@
+# sarah_db_rebuild_balances.py
+# Recomputes the client_balances read model from the ledger.
+# Run after any direct ledger edits that bypass Sarah._persist.
+
+from cloudstaff_core.agents.sarah import Sarah
+
+sarah = Sarah()
+count = sarah.rebuild_balances()
+print(f"client_balances rebuilt for {count} clients.")
@@ -4,6 +4,8 @@
 
 import sqlite3
 
+from cloudstaff_core.storage.ledger_schema import migrate_fts, migrate_indexes
+
 DB_FILE = "sarah.db"
 
 conn = sqlite3.connect(DB_FILE)
@@ -32,5 +34,12 @@ if "status" in missing_columns:
     cursor.execute("UPDATE ledger SET status = 'pending' WHERE status IS NULL")
 
 conn.commit()
+
+# Step 4: Composite indexes for the hot ledger queries
+print("Added indexes:", migrate_indexes(conn))
+
+# Step 5: Full-text search index for search_clients
+print("Full-text index:", "ready" if migrate_fts(conn) else "unavailable (no FTS5)")
+
 conn.close()
 print("Database upgrade complete.")